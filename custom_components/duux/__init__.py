@@ -21,6 +21,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Duux Fan from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    # Home Assistant owns the shared session and closes it on shutdown
     session = async_get_clientsession(hass)
     coordinator = DuuxDataUpdateCoordinator(
         hass,
@@ -43,4 +44,4 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
-    return unload_ok
\ No newline at end of file
+    return unload_ok
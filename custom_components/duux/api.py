@@ -4,48 +4,155 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from typing import Any
 
 import aiohttp
+import orjson
 
-from .const import API_BASE_URL
+from .const import API_BASE_URL, MAX_FAN_SPEED, MIN_FAN_SPEED, STATUS_CACHE_TTL
 
 _LOGGER = logging.getLogger(__name__)
 
+# Error bodies are only quoted in exception messages, so keep them short
+_ERROR_BODY_LIMIT = 200
+
+# Every command string the setters can send, indexed by the value being set
+_POWER_COMMANDS = ("tune set power 0", "tune set power 1")
+_HOROSC_COMMANDS = ("tune set horosc 0", "tune set horosc 1")
+_NIGHT_COMMANDS = ("tune set night 0", "tune set night 1")
+_SPEED_COMMANDS = tuple(f"tune set speed {speed}" for speed in range(MAX_FAN_SPEED + 1))
+_MODE_COMMANDS = ("tune set mode 0", "tune set mode 1")
+# Speeds set_speed accepts; a set lookup is cheaper than the chained comparison
+_VALID_SPEEDS = frozenset(range(MIN_FAN_SPEED, MAX_FAN_SPEED + 1))
+
+# Request bodies for the known commands, serialized once at import
+_ENCODED_COMMANDS = {
+    command: orjson.dumps({"command": command})
+    for command in (
+        *_POWER_COMMANDS,
+        *_HOROSC_COMMANDS,
+        *_NIGHT_COMMANDS,
+        *_SPEED_COMMANDS,
+        *_MODE_COMMANDS,
+    )
+}
+
 
 class DuuxApiError(Exception):
     """Exception for Duux API errors."""
 
 
-class DuuxApiClient:
-    """API client for Duux Fan."""
+async def _describe_error(response: aiohttp.ClientResponse) -> str:
+    """Summarize a failed response from its status and the start of its body."""
+    # The body is only quoted, so skip JSON parsing; reading it to the end
+    # also hands the connection back to the pool
+    body = await response.text()
+    return f"HTTP {response.status}: {body[:_ERROR_BODY_LIMIT]}"
 
-    def __init__(self, session: aiohttp.ClientSession, device_id: str, jwt_token: str) -> None:
+
+class DuuxApiClient:
+    """API client for Duux Fan.
+
+    Home Assistant passes its shared session, which the client never closes.
+    Without a session the client opens its own, so it should then be used as
+    ``async with DuuxApiClient(None, device_id, jwt_token) as client:`` or
+    closed with ``close()``.
+    """
+
+    __slots__ = (
+        "_owns_session",
+        "_session",
+        "_device_id",
+        "_jwt_token",
+        "_get_headers",
+        "_post_headers",
+        "_status_url",
+        "_command_url",
+        "_cached_status",
+        "_cache_expiry",
+        "_cache_lock",
+        "_inflight",
+    )
+
+    def __init__(
+        self, session: aiohttp.ClientSession | None, device_id: str, jwt_token: str
+    ) -> None:
         """Initialize the API client."""
-        self._session = session
+        self._owns_session = session is None
+        self._session = aiohttp.ClientSession() if session is None else session
         self._device_id = device_id
         self._jwt_token = jwt_token
-
-    async def send_command(self, command_text: str) -> dict[str, Any]:
-        """Send a text command to the Duux fan."""
-        url = f"{API_BASE_URL}/sensor/{self._device_id}/commands"
-        headers = {
+        # Request URLs and headers never change for a client, so build them once
+        self._get_headers = {"Authorization": f"Bearer {jwt_token}"}
+        self._post_headers = {
             "Content-Type": "application/json",
-            "Authorization": f"Bearer {self._jwt_token}",
-            "Host": API_BASE_URL.replace("https://", ""),
+            **self._get_headers,
         }
+        self._status_url = f"{API_BASE_URL}/data/{device_id}/status"
+        self._command_url = f"{API_BASE_URL}/sensor/{device_id}/commands"
+        # Short-lived status cache so bursts of reads share one request
+        self._cached_status: dict[str, Any] | None = None
+        self._cache_expiry = 0.0
+        self._cache_lock = asyncio.Lock()
+        # The most recently issued command and its request, while it is in flight
+        self._inflight: tuple[str, asyncio.Future[dict[str, Any]]] | None = None
+
+    async def __aenter__(self) -> DuuxApiClient:
+        """Return the client for use as an async context manager."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the session if the client opened it."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if the client opened it."""
+        if self._owns_session:
+            await self._session.close()
 
+    async def send_command(self, command_text: str) -> dict[str, Any]:
+        """Send a text command to the Duux fan.
+
+        A command identical to the most recently issued one shares its request
+        and result while that request is still in flight. Only the latest
+        command is joined, so a sequence such as on, off, on still sends all
+        three commands in order.
+        """
+        if self._inflight is not None and self._inflight[0] == command_text:
+            pending = self._inflight[1]
+        else:
+            pending = asyncio.ensure_future(self._post_command(command_text))
+            self._inflight = (command_text, pending)
+            pending.add_done_callback(self._clear_inflight)
+        # Shield the shared request so one cancelled caller does not cancel it
+        # for the others
+        return await asyncio.shield(pending)
+
+    def _clear_inflight(self, future: asyncio.Future[dict[str, Any]]) -> None:
+        """Forget a finished request unless a newer command replaced it."""
+        if self._inflight is not None and self._inflight[1] is future:
+            self._inflight = None
+
+    async def _post_command(self, command_text: str) -> dict[str, Any]:
+        """Post a text command to the Duux API."""
         try:
             # The API expects command as a text string in the format "tune set parameter value"
-            command_data = {"command": command_text}
+            command_data = _ENCODED_COMMANDS.get(command_text) or orjson.dumps(
+                {"command": command_text}
+            )
             async with self._session.post(
-                url, json=command_data, headers=headers
+                self._command_url, data=command_data, headers=self._post_headers
             ) as response:
                 if not response.ok:
-                    error_data = await response.json()
-                    raise DuuxApiError(f"Command failed: {error_data}")
-                
-                return await response.json()
+                    raise DuuxApiError(
+                        f"Command failed: {await _describe_error(response)}"
+                    )
+
+                result = await response.json(loads=orjson.loads)
+                # The device state changed, so the cached status is stale
+                self.expire_status_cache()
+                return result
         except asyncio.TimeoutError as err:
             raise DuuxApiError("Timeout connecting to Duux API") from err
         except aiohttp.ClientError as err:
@@ -53,44 +160,64 @@ class DuuxApiClient:
 
     async def get_status(self) -> dict[str, Any]:
         """Get the current status of the Duux fan."""
-        url = f"{API_BASE_URL}/data/{self._device_id}/status"
-        headers = {
-            "Authorization": f"Bearer {self._jwt_token}",
-            "Host": API_BASE_URL.replace("https://", ""),
-        }
+        if time.monotonic() < self._cache_expiry:
+            return self._cached_status
+
+        async with self._cache_lock:
+            # Another caller may have refreshed the cache while we waited
+            if time.monotonic() < self._cache_expiry:
+                return self._cached_status
+
+            status = await self._fetch_status()
+            self._cached_status = status
+            self._cache_expiry = time.monotonic() + STATUS_CACHE_TTL
+            return status
+
+    def expire_status_cache(self) -> None:
+        """Make the next get_status call fetch from the device."""
+        self._cache_expiry = 0.0
 
+    async def _fetch_status(self) -> dict[str, Any]:
+        """Request the current status from the Duux API."""
         try:
-            async with self._session.get(url, headers=headers) as response:
+            async with self._session.get(
+                self._status_url, headers=self._get_headers
+            ) as response:
                 if not response.ok:
-                    error_data = await response.json()
-                    raise DuuxApiError(f"Status request failed: {error_data}")
-                
-                return await response.json()
+                    raise DuuxApiError(
+                        f"Status request failed: {await _describe_error(response)}"
+                    )
+
+                body = await response.json(loads=orjson.loads)
         except asyncio.TimeoutError as err:
             raise DuuxApiError("Timeout connecting to Duux API") from err
         except aiohttp.ClientError as err:
             raise DuuxApiError(f"Error connecting to Duux API: {err}") from err
 
+        # Only the "data" subtree is used, so don't keep the rest of the payload alive
+        if isinstance(body, dict) and "data" in body:
+            return {"data": body["data"]}
+        return body
+
     async def turn_on(self) -> None:
         """Turn on the fan."""
-        await self.send_command("tune set power 1")
+        await self.send_command(_POWER_COMMANDS[1])
 
     async def turn_off(self) -> None:
         """Turn off the fan."""
-        await self.send_command("tune set power 0")
+        await self.send_command(_POWER_COMMANDS[0])
 
     async def set_speed(self, speed: int) -> None:
         """Set fan speed (1-30)."""
-        if not 1 <= speed <= 30:
+        if speed not in _VALID_SPEEDS:
             raise ValueError("Speed must be between 1 and 30")
-        await self.send_command(f"tune set speed {speed}")
+        # Integral floats such as 15.0 pass the set lookup but cannot index the tuple
+        await self.send_command(_SPEED_COMMANDS[int(speed)])
 
     async def set_oscillation(self, oscillate: bool) -> None:
         """Set horizontal oscillation."""
-        value = 1 if oscillate else 0
-        await self.send_command(f"tune set horosc {value}")
+        await self.send_command(_HOROSC_COMMANDS[bool(oscillate)])
 
     async def set_night_mode(self, night_mode: bool) -> None:
         """Set night mode."""
-        value = 1 if night_mode else 0
-        await self.send_command(f"tune set night {value}")
\ No newline at end of file
+        await self.send_command(_NIGHT_COMMANDS[bool(night_mode)])
\ No newline at end of file
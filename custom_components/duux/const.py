@@ -1,5 +1,7 @@
 """Constants for the Duux Fan integration."""
 
+import re
+
 DOMAIN = "duux"
 
 API_BASE_URL = "https://v5.api.cloudgarden.nl"
@@ -7,6 +9,21 @@ API_BASE_URL = "https://v5.api.cloudgarden.nl"
 # Default device polling interval in seconds
 DEFAULT_SCAN_INTERVAL = 30
 
+# Upper bound for the polling interval while the device state is unchanged
+MAX_SCAN_INTERVAL = 300
+
+# Factor the polling interval grows by after each unchanged poll
+SCAN_INTERVAL_BACKOFF = 1.5
+
+# How long a fetched device status may be reused, in seconds
+STATUS_CACHE_TTL = 5.0
+
+# Seconds to wait for the device to confirm a command before refreshing again
+COMMAND_CONFIRM_TIMEOUT = 1.0
+
+# Seconds to collect speed changes (e.g. a slider drag) into one command
+SPEED_DEBOUNCE_COOLDOWN = 0.15
+
 # Fan speed mappings
 MIN_FAN_SPEED = 1
 MAX_FAN_SPEED = 30
@@ -14,4 +31,22 @@ MIN_PERCENTAGE = 1
 MAX_PERCENTAGE = 100
 
 # Repair issue identifiers
-REPAIR_ISSUE_AUTH_FAILED = "auth_failed"
\ No newline at end of file
+REPAIR_ISSUE_AUTH_FAILED = "auth_failed"
+
+# Matches API error messages that indicate an authentication failure
+AUTH_ERROR_PATTERN = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "unauthorized",
+                "invalid token",
+                "authentication failed",
+                "401",
+                "403",
+                "token expired",
+            ),
+        )
+    ),
+    re.IGNORECASE,
+)
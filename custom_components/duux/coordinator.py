@@ -1,24 +1,48 @@
 """Data update coordinator for Duux Fan."""
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Mapping
 from datetime import timedelta
 from typing import Any
 
 import aiohttp
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import DuuxApiClient, DuuxApiError
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, REPAIR_ISSUE_AUTH_FAILED
+from .const import (
+    AUTH_ERROR_PATTERN,
+    COMMAND_CONFIRM_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    REPAIR_ISSUE_AUTH_FAILED,
+    SCAN_INTERVAL_BACKOFF,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Poll history is kept as a bitmask, newest poll in the lowest bit (1 = auth failure)
+_AUTH_HISTORY_MASK = 0xFFFFFFFF
+# A repair issue is raised after 3 consecutive auth failures
+_AUTH_REPAIR_PATTERN = 0b111
+
 
 class DuuxDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Data update coordinator for Duux Fan."""
 
+    __slots__ = (
+        "api",
+        "device_info",
+        "_device_id",
+        "_auth_history",
+        "_repair_issue_created",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -29,13 +53,23 @@ class DuuxDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Initialize the coordinator."""
         self.api = DuuxApiClient(session, device_id, jwt_token)
         self._device_id = device_id
-        self._auth_failure_count = 0
+        # Shared by every entity of this device
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name="Duux Fan",
+            manufacturer="Duux",
+            model="Smart Fan",
+        )
+        self._auth_history = 0
         self._repair_issue_created = False
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Status payloads are plain dicts, so unchanged polls compare equal
+            # and skip the entity state writes
+            always_update=False,
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
@@ -45,38 +79,82 @@ class DuuxDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if "data" not in response:
                 raise UpdateFailed("Invalid response from Duux API")
             
-            # Reset auth failure count on successful request
-            if self._auth_failure_count > 0:
-                self._auth_failure_count = 0
-                # Remove repair issue if it was created
-                if self._repair_issue_created:
-                    ir.async_delete_issue(self.hass, DOMAIN, REPAIR_ISSUE_AUTH_FAILED)
-                    self._repair_issue_created = False
-            
-            return response["data"]
+            # Record a successful request and remove the repair issue if it was created
+            self._auth_history = (self._auth_history << 1) & _AUTH_HISTORY_MASK
+            if self._repair_issue_created:
+                ir.async_delete_issue(self.hass, DOMAIN, REPAIR_ISSUE_AUTH_FAILED)
+                self._repair_issue_created = False
+
+            data = response["data"]
+            self._adjust_update_interval(data)
+            return data
         except DuuxApiError as err:
             # Check if this is an authentication error
             if self._is_auth_error(str(err)):
-                self._auth_failure_count += 1
+                self._auth_history = ((self._auth_history << 1) | 1) & _AUTH_HISTORY_MASK
                 # Create repair issue after 3 consecutive auth failures
-                if self._auth_failure_count >= 3 and not self._repair_issue_created:
+                if (
+                    self._auth_history & _AUTH_REPAIR_PATTERN == _AUTH_REPAIR_PATTERN
+                    and not self._repair_issue_created
+                ):
                     self._create_auth_repair_issue()
                     self._repair_issue_created = True
             
             raise UpdateFailed(f"Error communicating with Duux API: {err}") from err
 
+    def notify_command_sent(self) -> None:
+        """Return to the default polling interval after a user command."""
+        self.update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+    async def async_confirm_state(self, expected: Mapping[str, int]) -> None:
+        """Refresh until the device reports the state a command asked for.
+
+        The first refresh often already reflects the change. Otherwise any
+        coordinator update within COMMAND_CONFIRM_TIMEOUT can confirm it, and
+        a final refresh is forced once the timeout passes. That refresh skips
+        the API client's status cache, which still holds the first answer.
+        """
+        confirmed = asyncio.Event()
+
+        @callback
+        def _async_check_state() -> None:
+            if self._state_matches(expected):
+                confirmed.set()
+
+        remove_listener = self.async_add_listener(_async_check_state)
+        try:
+            await self.async_request_refresh()
+            # Unchanged data does not notify listeners, so check it directly too
+            if self._state_matches(expected):
+                return
+            try:
+                async with asyncio.timeout(COMMAND_CONFIRM_TIMEOUT):
+                    await confirmed.wait()
+            except TimeoutError:
+                self.api.expire_status_cache()
+                await self.async_refresh()
+        finally:
+            remove_listener()
+
+    def _state_matches(self, expected: Mapping[str, int]) -> bool:
+        """Return true if the latest data reports the expected state."""
+        data = self.data
+        return data is not None and all(
+            data.get(key) == value for key, value in expected.items()
+        )
+
+    def _adjust_update_interval(self, data: dict[str, Any]) -> None:
+        """Poll less often while the device state stays unchanged."""
+        if data != self.data:
+            self.update_interval = timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+            return
+
+        seconds = self.update_interval.total_seconds() * SCAN_INTERVAL_BACKOFF
+        self.update_interval = timedelta(seconds=min(seconds, MAX_SCAN_INTERVAL))
+
     def _is_auth_error(self, error_message: str) -> bool:
         """Check if the error is related to authentication."""
-        auth_error_indicators = [
-            "unauthorized",
-            "invalid token",
-            "authentication failed",
-            "401",
-            "403",
-            "token expired"
-        ]
-        error_lower = error_message.lower()
-        return any(indicator in error_lower for indicator in auth_error_indicators)
+        return AUTH_ERROR_PATTERN.search(error_message) is not None
 
     def _create_auth_repair_issue(self) -> None:
         """Create a repair issue for authentication failures."""
@@ -3,12 +3,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Awaitable
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.percentage import (
@@ -18,13 +20,38 @@ from homeassistant.util.percentage import (
 )
 
 from .api import DuuxApiError
-from .const import DOMAIN, MAX_FAN_SPEED, MIN_FAN_SPEED, REPAIR_ISSUE_AUTH_FAILED
+from .const import (
+    AUTH_ERROR_PATTERN,
+    DOMAIN,
+    MAX_FAN_SPEED,
+    MIN_FAN_SPEED,
+    REPAIR_ISSUE_AUTH_FAILED,
+    SPEED_DEBOUNCE_COOLDOWN,
+)
 from .coordinator import DuuxDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 SPEED_RANGE = (MIN_FAN_SPEED, MAX_FAN_SPEED)
 
+# Both conversions have small integer domains, so resolve them once at import
+_PCT_FROM_SPEED = tuple(
+    ranged_value_to_percentage(SPEED_RANGE, speed) for speed in range(MAX_FAN_SPEED + 1)
+)
+_SPEED_FROM_PCT = tuple(
+    int(percentage_to_ranged_value(SPEED_RANGE, percentage)) for percentage in range(101)
+)
+
+
+def _percentage_from_speed(speed: int) -> int:
+    """Return the percentage for a reported speed, clamped to the table."""
+    return _PCT_FROM_SPEED[max(0, min(int(speed), MAX_FAN_SPEED))]
+
+
+def _speed_from_percentage(percentage: int) -> int:
+    """Return the device speed for a percentage, clamped to the table."""
+    return _SPEED_FROM_PCT[max(0, min(int(percentage), 100))]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -56,45 +83,30 @@ class DuuxFan(CoordinatorEntity[DuuxDataUpdateCoordinator], FanEntity):
     ) -> None:
         """Initialize the fan."""
         super().__init__(coordinator)
+        self._pending_percentage: int | None = None
+        self._speed_sent: asyncio.Future[None] | None = None
+        self._speed_debouncer = Debouncer(
+            coordinator.hass,
+            _LOGGER,
+            cooldown=SPEED_DEBOUNCE_COOLDOWN,
+            immediate=False,
+            function=self._async_send_pending_percentage,
+        )
         self._attr_unique_id = config_entry.data["device_id"]
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.data["device_id"])},
-            "name": "Duux Fan",
-            "manufacturer": "Duux",
-            "model": "Smart Fan",
-        }
+        self._attr_device_info = coordinator.device_info
+        self._update_attr()
 
     @property
     def is_on(self) -> bool | None:
         """Return true if the fan is on."""
-        if self.coordinator.data is None:
-            return None
-        return bool(self.coordinator.data.get("power", 0))
-
-    @property
-    def percentage(self) -> int | None:
-        """Return the current speed percentage."""
-        if self.coordinator.data is None:
-            return None
-        
-        speed = self.coordinator.data.get("speed")
-        if speed is None:
-            return None
-        
-        return ranged_value_to_percentage(SPEED_RANGE, int(speed))
+        # FanEntity derives is_on from the percentage, so expose the cached value
+        return self._attr_is_on
 
     @property
     def speed_count(self) -> int:
         """Return the number of speeds the fan supports."""
         return int_states_in_range(SPEED_RANGE)
 
-    @property
-    def oscillating(self) -> bool | None:
-        """Return true if the fan is oscillating."""
-        if self.coordinator.data is None:
-            return None
-        return bool(self.coordinator.data.get("horosc", 0))
-
     async def async_turn_on(
         self,
         percentage: int | None = None,
@@ -102,53 +114,131 @@ class DuuxFan(CoordinatorEntity[DuuxDataUpdateCoordinator], FanEntity):
         **kwargs: Any,
     ) -> None:
         """Turn on the fan."""
-        try:
-            await self.coordinator.api.turn_on()
-            
-            if percentage is not None:
-                speed = percentage_to_ranged_value(SPEED_RANGE, percentage)
-                await self.coordinator.api.set_speed(int(speed))
-            
-            # Wait for device to process command before refreshing
-            await asyncio.sleep(1)
-            await self.coordinator.async_request_refresh()
-        except DuuxApiError as err:
-            self._handle_api_error(err, "Failed to turn on fan")
-            _LOGGER.error("Failed to turn on fan: %s", err)
+        if percentage is None:
+            await self._async_send_command(
+                self.coordinator.api.turn_on(), {"power": 1}, "Failed to turn on fan"
+            )
+            return
+
+        speed = _speed_from_percentage(percentage)
+        await self._async_send_command(
+            self._async_turn_on_at_speed(speed),
+            {"power": 1, "speed": speed},
+            "Failed to turn on fan",
+        )
+
+    async def _async_turn_on_at_speed(self, speed: int) -> None:
+        """Turn the fan on, then set its speed."""
+        # The device may ignore a speed sent before it has powered on
+        await self.coordinator.api.turn_on()
+        await self.coordinator.api.set_speed(speed)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the fan."""
-        try:
-            await self.coordinator.api.turn_off()
-            # Wait for device to process command before refreshing
-            await asyncio.sleep(1)
-            await self.coordinator.async_request_refresh()
-        except DuuxApiError as err:
-            self._handle_api_error(err, "Failed to turn off fan")
-            _LOGGER.error("Failed to turn off fan: %s", err)
+        await self._async_send_command(
+            self.coordinator.api.turn_off(), {"power": 0}, "Failed to turn off fan"
+        )
 
     async def async_set_percentage(self, percentage: int) -> None:
-        """Set the speed of the fan, as a percentage."""
+        """Set the speed of the fan, as a percentage.
+
+        Only the last value of a burst (e.g. a slider drag) is sent, and every
+        call of the burst returns once that value has been sent.
+        """
+        self._pending_percentage = percentage
+        if self._speed_sent is None:
+            self._speed_sent = asyncio.get_running_loop().create_future()
+        speed_sent = self._speed_sent
+        await self._speed_debouncer.async_call()
+        # Shielded, so one cancelled caller does not cancel it for the others
+        await asyncio.shield(speed_sent)
+
+    async def _async_send_pending_percentage(self) -> None:
+        """Send the most recently requested speed to the fan."""
         try:
-            speed = percentage_to_ranged_value(SPEED_RANGE, percentage)
-            await self.coordinator.api.set_speed(int(speed))
-            # Wait for device to process command before refreshing
-            await asyncio.sleep(1)
-            await self.coordinator.async_request_refresh()
-        except DuuxApiError as err:
-            self._handle_api_error(err, "Failed to set fan speed")
-            _LOGGER.error("Failed to set fan speed: %s", err)
+            # The debouncer drops calls made while this runs, so send any speed
+            # requested in the meantime before returning
+            while (percentage := self._pending_percentage) is not None:
+                self._pending_percentage = None
+                speed_sent, self._speed_sent = self._speed_sent, None
+
+                try:
+                    speed = _speed_from_percentage(percentage)
+                    await self._async_send_command(
+                        self.coordinator.api.set_speed(speed),
+                        {"speed": speed},
+                        "Failed to set fan speed",
+                    )
+                except Exception as err:  # pylint: disable=broad-except
+                    # Raise it to the service calls waiting on this speed, and
+                    # still send any speed queued behind it
+                    if speed_sent is not None and not speed_sent.done():
+                        speed_sent.set_exception(err)
+                else:
+                    if speed_sent is not None and not speed_sent.done():
+                        speed_sent.set_result(None)
+                finally:
+                    # Still pending only if this send was cancelled
+                    if speed_sent is not None and not speed_sent.done():
+                        speed_sent.cancel()
+        finally:
+            # Only reached with a speed still queued if the send was cancelled;
+            # release its callers rather than leave them waiting forever
+            self._pending_percentage = None
+            if self._speed_sent is not None:
+                self._speed_sent.cancel()
+                self._speed_sent = None
 
     async def async_oscillate(self, oscillating: bool) -> None:
         """Set oscillation."""
+        await self._async_send_command(
+            self.coordinator.api.set_oscillation(oscillating),
+            {"horosc": int(oscillating)},
+            "Failed to set fan oscillation",
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop any speed change that has not been sent yet."""
+        self._speed_debouncer.async_cancel()
+        self._pending_percentage = None
+        if self._speed_sent is not None:
+            self._speed_sent.cancel()
+            self._speed_sent = None
+        await super().async_will_remove_from_hass()
+
+    async def _async_send_command(
+        self, command: Awaitable[Any], expected: dict[str, int], context: str
+    ) -> None:
+        """Await a device command, then wait for the device to confirm it."""
         try:
-            await self.coordinator.api.set_oscillation(oscillating)
-            # Wait for device to process command before refreshing
-            await asyncio.sleep(1)
-            await self.coordinator.async_request_refresh()
+            await command
+            self.coordinator.notify_command_sent()
+            await self.coordinator.async_confirm_state(expected)
         except DuuxApiError as err:
-            self._handle_api_error(err, "Failed to set fan oscillation")
-            _LOGGER.error("Failed to set fan oscillation: %s", err)
+            self._handle_api_error(err, context)
+            _LOGGER.error("%s: %s", context, err)
+
+    def _update_attr(self) -> None:
+        """Cache the entity state from the latest coordinator data."""
+        data = self.coordinator.data
+        if data is None:
+            self._attr_is_on = None
+            self._attr_percentage = None
+            self._attr_oscillating = None
+            return
+
+        self._attr_is_on = bool(data.get("power", 0))
+        speed = data.get("speed")
+        self._attr_percentage = (
+            None if speed is None else _percentage_from_speed(speed)
+        )
+        self._attr_oscillating = bool(data.get("horosc", 0))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_attr()
+        super()._handle_coordinator_update()
 
     def _handle_api_error(self, error: DuuxApiError, context: str) -> None:
         """Handle API errors and create repair issues for auth failures."""
@@ -167,13 +257,4 @@ class DuuxFan(CoordinatorEntity[DuuxDataUpdateCoordinator], FanEntity):
 
     def _is_auth_error(self, error_message: str) -> bool:
         """Check if the error is related to authentication."""
-        auth_error_indicators = [
-            "unauthorized",
-            "invalid token",
-            "authentication failed",
-            "401",
-            "403",
-            "token expired"
-        ]
-        error_lower = error_message.lower()
-        return any(indicator in error_lower for indicator in auth_error_indicators)
\ No newline at end of file
+        return AUTH_ERROR_PATTERN.search(error_message) is not None
\ No newline at end of file
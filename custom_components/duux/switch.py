@@ -1,7 +1,6 @@
 """Platform for Duux switch integration."""
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any
 
@@ -13,7 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import DuuxApiError
-from .const import DOMAIN, REPAIR_ISSUE_AUTH_FAILED
+from .const import AUTH_ERROR_PATTERN, DOMAIN, REPAIR_ISSUE_AUTH_FAILED
 from .coordinator import DuuxDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,42 +44,34 @@ class DuuxNaturalWindSwitch(CoordinatorEntity[DuuxDataUpdateCoordinator], Switch
         """Initialize the switch."""
         super().__init__(coordinator)
         self._attr_unique_id = f"{config_entry.data['device_id']}_natural_wind"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.data["device_id"])},
-            "name": "Duux Fan",
-            "manufacturer": "Duux",
-            "model": "Smart Fan",
-        }
+        self._attr_device_info = coordinator.device_info
 
     @property
     def is_on(self) -> bool | None:
         """Return true if Natural Wind mode is on."""
-        if self.coordinator.data is None:
+        data = self.coordinator.data
+        if data is None:
             return None
         # mode 1 = Natural Wind on, mode 0 = Natural Wind off
-        return bool(self.coordinator.data.get("mode", 0) == 1)
+        return data.get("mode", 0) == 1
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on Natural Wind mode."""
-        try:
-            await self.coordinator.api.send_command("tune set mode 1")
-            # Wait for device to process command before refreshing
-            await asyncio.sleep(1)
-            await self.coordinator.async_request_refresh()
-        except DuuxApiError as err:
-            self._handle_api_error(err, "Failed to turn on Natural Wind mode")
-            _LOGGER.error("Failed to turn on Natural Wind mode: %s", err)
+        await self._async_set_mode(1, "Failed to turn on Natural Wind mode")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off Natural Wind mode."""
+        await self._async_set_mode(0, "Failed to turn off Natural Wind mode")
+
+    async def _async_set_mode(self, mode: int, context: str) -> None:
+        """Send a mode command, then wait for the device to confirm it."""
         try:
-            await self.coordinator.api.send_command("tune set mode 0")
-            # Wait for device to process command before refreshing
-            await asyncio.sleep(1)
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.api.send_command(f"tune set mode {mode}")
+            self.coordinator.notify_command_sent()
+            await self.coordinator.async_confirm_state({"mode": mode})
         except DuuxApiError as err:
-            self._handle_api_error(err, "Failed to turn off Natural Wind mode")
-            _LOGGER.error("Failed to turn off Natural Wind mode: %s", err)
+            self._handle_api_error(err, context)
+            _LOGGER.error("%s: %s", context, err)
 
     def _handle_api_error(self, error: DuuxApiError, context: str) -> None:
         """Handle API errors and create repair issues for auth failures."""
@@ -99,13 +90,4 @@ class DuuxNaturalWindSwitch(CoordinatorEntity[DuuxDataUpdateCoordinator], Switch
 
     def _is_auth_error(self, error_message: str) -> bool:
         """Check if the error is related to authentication."""
-        auth_error_indicators = [
-            "unauthorized",
-            "invalid token",
-            "authentication failed",
-            "401",
-            "403",
-            "token expired"
-        ]
-        error_lower = error_message.lower()
-        return any(indicator in error_lower for indicator in auth_error_indicators)
\ No newline at end of file
+        return AUTH_ERROR_PATTERN.search(error_message) is not None
\ No newline at end of file
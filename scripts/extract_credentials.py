@@ -17,14 +17,22 @@ Author: Duux Home Assistant Integration
 
 import argparse
 import asyncio
+import contextlib
+import importlib.util
 import json
 import logging
+import os
 import re
 import signal
 import socket
 import subprocess
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib json module is used without it
+    orjson = None
 
 # Configure logging - silence mitmproxy completely
 logging.basicConfig(
@@ -32,11 +40,11 @@ logging.basicConfig(
     format='%(message)s'    # Simplified format
 )
 
-# Silence specific mitmproxy loggers
-logging.getLogger("mitmproxy").setLevel(logging.CRITICAL)
-logging.getLogger("mitmproxy.master").setLevel(logging.CRITICAL)
-logging.getLogger("mitmproxy.http").setLevel(logging.CRITICAL)
-logging.getLogger("mitmproxy.net").setLevel(logging.CRITICAL)
+# Silence mitmproxy; its child loggers inherit this effective level, so
+# their records are dropped before any message formatting happens
+mitmproxy_logger = logging.getLogger("mitmproxy")
+mitmproxy_logger.setLevel(logging.CRITICAL)
+mitmproxy_logger.propagate = False
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)  # Allow our info messages
@@ -74,29 +82,41 @@ def install_mitmproxy() -> bool:
 
 def check_mitmproxy() -> bool:
     """Check if mitmproxy is available, install if not."""
-    try:
-        import mitmproxy
+    # find_spec locates the package without running its (heavy) import
+    if importlib.util.find_spec("mitmproxy") is not None:
         return True
-    except ImportError:
-        # Try to auto-install
-        if install_mitmproxy():
-            try:
-                import mitmproxy
-                return True
-            except ImportError:
-                return False
+
+    # Try to auto-install
+    if not install_mitmproxy():
         return False
+    importlib.invalidate_caches()
+    return importlib.util.find_spec("mitmproxy") is not None
 
 
 class DuuxCredentialCapture:
     """Mitmproxy addon to capture Duux API credentials."""
 
+    __slots__ = ("captured_credentials", "credentials_captured", "captured_event")
+
     def __init__(self):
         self.captured_credentials: Dict[str, Any] = {}
         self.credentials_captured = False
+        self.captured_event = asyncio.Event()
 
     def request(self, flow) -> None:
         """Process HTTP requests to capture Duux API credentials."""
+        # Extract device ID from a /data/<device_id>/status URL path first;
+        # a plain substring check rejects most unrelated flows before the regex
+        path = flow.request.path
+        if "/status" not in path:
+            return
+
+        match = DEVICE_ID_PATTERN.search(path)
+        if not match:
+            return
+
+        device_id = match.group(1)
+
         if not flow.request.pretty_host == DUUX_API_HOST:
             return
 
@@ -105,19 +125,14 @@ class DuuxCredentialCapture:
         if not auth_header:
             return
 
-        jwt_token = None
-        if auth_header.startswith("Bearer "):
-            jwt_token = auth_header[7:]  # Remove "Bearer " prefix
-        
-        if not jwt_token:
+        # removeprefix returns the header unchanged when it is not a Bearer token
+        jwt_token = auth_header.removeprefix("Bearer ")
+        if jwt_token == auth_header or not jwt_token:
             return
 
-        # Extract device ID from URL path
-        match = DEVICE_ID_PATTERN.search(flow.request.path)
-        if not match:
+        # The app repeats the same token on every poll; only capture it once
+        if jwt_token == self.captured_credentials.get("jwt_token"):
             return
-
-        device_id = match.group(1)
         
         print(f"✅ Captured Device ID: {device_id}")
 
@@ -128,6 +143,7 @@ class DuuxCredentialCapture:
         
         # Signal that credentials have been captured
         self.credentials_captured = True
+        self.captured_event.set()
 
     def get_credentials(self) -> Dict[str, Any]:
         """Get the captured credentials."""
@@ -140,26 +156,29 @@ class DuuxCredentialCapture:
 
 class DuuxCredentialExtractor:
     """Main credential extraction coordinator."""
-    
+
+    __slots__ = ("port", "proxy_master", "capture_addon", "running", "_local_ip")
+
     def __init__(self, port: int = 8080):
         self.port = port
         self.proxy_master = None
         self.capture_addon = DuuxCredentialCapture()
         self.running = False
+        self._local_ip: Optional[str] = None
         
     def find_free_port(self) -> int:
         """Find a free port if the specified one is in use."""
         try:
+            # No SO_REUSEADDR: on Windows it lets the bind succeed even while
+            # another process is listening on the port
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.bind(("", self.port))
                 return self.port
         except OSError:
-            # Port in use, find a free one
+            # Port in use, let the kernel pick a free one
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
                 s.bind(("", 0))
-                s.listen(1)
-                port = s.getsockname()[1]
-                return port
+                return s.getsockname()[1]
 
     def get_local_ip(self) -> str:
         """Get the local IP address of this machine."""
@@ -174,74 +193,60 @@ class DuuxCredentialExtractor:
             # Fallback to localhost if unable to determine
             return "127.0.0.1"
 
+    def _resolve_network(self) -> Tuple[int, str]:
+        """Pick the proxy port and local IP once; neither changes during a run."""
+        if self._local_ip is None:
+            self.port = self.find_free_port()
+            self._local_ip = self.get_local_ip()
+        return self.port, self._local_ip
+
     async def start_proxy(self) -> None:
         """Start the mitmproxy server using Python API."""
         from mitmproxy import options
         from mitmproxy.tools.dump import DumpMaster
         
         # Find a free port and get local IP
-        self.port = self.find_free_port()
-        local_ip = self.get_local_ip()
+        port, local_ip = self._resolve_network()
         
-        print(f"🚀 Proxy started on port {self.port}")
-        print(f"📱 Configure mobile proxy: {local_ip}:{self.port}")
+        print(f"🚀 Proxy started on port {port}")
+        print(f"📱 Configure mobile proxy: {local_ip}:{port}")
         print("🔒 Install certificate: http://mitm.it")
         print("📲 Use Duux app → credentials will be captured automatically")
         print("⏹️  Press Ctrl+C to stop\n")
         
         # Configure mitmproxy options
+        # Only plain HTTP/1 requests are inspected, so skip the HTTP/2,
+        # WebSocket and raw TCP handling mitmproxy would otherwise set up
         opts = options.Options(
-            listen_port=self.port, 
-            ssl_insecure=True
+            listen_port=port,
+            ssl_insecure=True,
+            http2=False,
+            websocket=False,
+            rawtcp=False,
         )
         
-        # Create proxy master within async context
-        self.proxy_master = DumpMaster(opts)
+        # Create proxy master within async context. Flow dumping and terminal
+        # logging are disabled so the proxy never writes a line per request.
+        self.proxy_master = DumpMaster(opts, with_termlog=False, with_dumper=False)
         self.proxy_master.addons.add(self.capture_addon)
         self.running = True
         
-        # Create tasks for proxy and credential monitoring
+        # Run until credentials are captured or the proxy stops (Ctrl+C)
         proxy_task = asyncio.create_task(self.proxy_master.run())
-        monitor_task = asyncio.create_task(self._monitor_capture())
-        
-        try:
-            # Wait for either proxy to finish or credentials to be captured
-            done, pending = await asyncio.wait(
-                [proxy_task, monitor_task],
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            # Cancel pending tasks
-            for task in pending:
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                    
-        except KeyboardInterrupt:
-            print("🛑 Stopped by user")
-            # Cancel tasks
-            proxy_task.cancel()
-            monitor_task.cancel()
-            try:
-                await proxy_task
-            except asyncio.CancelledError:
-                pass
-            try:
-                await monitor_task
-            except asyncio.CancelledError:
-                pass
-
-    async def _monitor_capture(self) -> None:
-        """Monitor for credential capture in async context."""
-        while self.running:
-            if self.capture_addon.has_credentials():
-                self.running = False
-                if self.proxy_master:
-                    self.proxy_master.shutdown()
-                break
-            await asyncio.sleep(1.0)  # Check every second
+        captured_task = asyncio.create_task(self.capture_addon.captured_event.wait())
+        await asyncio.wait(
+            [proxy_task, captured_task],
+            return_when=asyncio.FIRST_COMPLETED
+        )
+
+        if captured_task.done():
+            # Let mitmproxy unwind through its own shutdown instead of cancelling it
+            self.stop_proxy()
+            await proxy_task
+        else:
+            captured_task.cancel()
+            # Surface proxy startup errors (e.g. port in use) to the caller
+            proxy_task.result()
 
     def stop_proxy(self) -> None:
         """Stop the proxy server."""
@@ -272,10 +277,26 @@ class DuuxCredentialExtractor:
             print("   4. Enter the Device ID and JWT Token above")
             print("=" * 60)
             
-            # Save to a permanent file
+            # Save to a permanent file, replacing any previous one atomically
             output_file = "duux_credentials.json"
-            with open(output_file, 'w') as f:
-                json.dump(credentials, f, indent=2)
+            tmp_file = f"{output_file}.tmp"
+            if orjson is not None:
+                payload = orjson.dumps(credentials, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(credentials, indent=2).encode()
+            # os.open only applies the mode to a new file, so drop any tmp
+            # file an interrupted run left behind instead of reusing it
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp_file)
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_file, output_file)
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(tmp_file)
+                raise
             print(f"💾 Credentials saved to: {output_file}")
             
         except Exception as err:
@@ -303,11 +324,16 @@ async def main():
     
     extractor = DuuxCredentialExtractor(args.port)
     
-    # Handle Ctrl+C gracefully
-    def signal_handler(sig, frame):
+    # Handle Ctrl+C gracefully, on the event loop so shutdown runs only once
+    def stop_by_user():
+        print("🛑 Stopped by user")
         extractor.stop_proxy()
-    
-    signal.signal(signal.SIGINT, signal_handler)
+
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, stop_by_user)
+    except NotImplementedError:
+        # Windows event loops do not support add_signal_handler
+        signal.signal(signal.SIGINT, lambda sig, frame: stop_by_user())
     
     try:
         await extractor.start_proxy()
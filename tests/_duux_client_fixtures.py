@@ -0,0 +1,179 @@
+"""Standalone copy of the Duux API client logic shared by the API tests."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import aiohttp
+
+_API_HOST = "v5.api.cloudgarden.nl"
+_API_BASE_URL = f"https://{_API_HOST}"
+
+# Command strings for the text command client, indexed by value as in the
+# production client
+_POWER_COMMANDS = ("tune set power 0", "tune set power 1")
+_HOROSC_COMMANDS = ("tune set horosc 0", "tune set horosc 1")
+_NIGHT_COMMANDS = ("tune set night 0", "tune set night 1")
+_SPEED_COMMANDS = tuple(f"tune set speed {speed}" for speed in range(31))
+_MODE_COMMANDS = tuple(f"tune set mode {mode}" for mode in range(4))
+# Fixed command payloads for the dict command client, indexed by value;
+# send_command only serializes them, so they are safe to share
+_POWER_PAYLOADS = ({"power": 0}, {"power": 1})
+_HOROSC_PAYLOADS = ({"horosc": 0}, {"horosc": 1})
+_NIGHT_PAYLOADS = ({"night": 0}, {"night": 1})
+# Speeds set_speed accepts, as in the production client
+_VALID_SPEEDS = frozenset(range(1, 31))
+
+
+class DuuxApiError(Exception):
+    """Exception for Duux API errors."""
+
+
+class DuuxApiClient:
+    """API client for Duux Fan - standalone version for testing."""
+
+    def __init__(self, session, device_id: str, jwt_token: str) -> None:
+        """Initialize the API client."""
+        self._session = session
+        self._device_id = device_id
+        self._jwt_token = jwt_token
+        # Request URLs and headers never change for a client, so build them once
+        self._get_headers = {
+            "Authorization": f"Bearer {jwt_token}",
+            "Host": _API_HOST,
+        }
+        self._post_headers = {
+            "Content-Type": "application/json",
+            **self._get_headers,
+        }
+        self._status_url = f"{_API_BASE_URL}/data/{device_id}/status"
+        self._command_url = f"{_API_BASE_URL}/sensor/{device_id}/commands"
+
+    async def send_command(self, command: dict) -> dict:
+        """Send a command to the Duux fan."""
+        try:
+            # The API expects the command to be a JSON string, not an object
+            command_data = {"command": json.dumps(command)}
+            async with self._session.post(
+                self._command_url, json=command_data, headers=self._post_headers
+            ) as response:
+                if not response.ok:
+                    body = await response.text()
+                    raise DuuxApiError(f"Command failed: HTTP {response.status}: {body[:200]}")
+                
+                return await response.json()
+        except asyncio.TimeoutError as err:
+            raise DuuxApiError("Timeout connecting to Duux API") from err
+        except aiohttp.ClientError as err:
+            raise DuuxApiError(f"Error connecting to Duux API: {err}") from err
+
+    async def get_status(self) -> dict:
+        """Get the current status of the Duux fan."""
+        try:
+            async with self._session.get(
+                self._status_url, headers=self._get_headers
+            ) as response:
+                if not response.ok:
+                    body = await response.text()
+                    raise DuuxApiError(f"Status request failed: HTTP {response.status}: {body[:200]}")
+                
+                return await response.json()
+        except asyncio.TimeoutError as err:
+            raise DuuxApiError("Timeout connecting to Duux API") from err
+        except aiohttp.ClientError as err:
+            raise DuuxApiError(f"Error connecting to Duux API: {err}") from err
+
+    async def turn_on(self) -> None:
+        """Turn on the fan."""
+        await self.send_command(_POWER_PAYLOADS[1])
+
+    async def turn_off(self) -> None:
+        """Turn off the fan."""
+        await self.send_command(_POWER_PAYLOADS[0])
+
+    async def set_speed(self, speed: int) -> None:
+        """Set fan speed (1-30)."""
+        if speed not in _VALID_SPEEDS:
+            raise ValueError("Speed must be between 1 and 30")
+        await self.send_command({"speed": speed})
+
+    async def set_oscillation(self, oscillate: bool) -> None:
+        """Set horizontal oscillation."""
+        await self.send_command(_HOROSC_PAYLOADS[bool(oscillate)])
+
+    async def set_mode(self, mode: int) -> None:
+        """Set fan mode."""
+        await self.send_command({"mode": mode})
+
+    async def set_night_mode(self, night_mode: bool) -> None:
+        """Set night mode."""
+        await self.send_command(_NIGHT_PAYLOADS[bool(night_mode)])
+
+
+class TextCommandApiClient:
+    """API client for Duux Fan - text command version."""
+
+    def __init__(self, session, device_id: str, jwt_token: str) -> None:
+        """Initialize the API client."""
+        self._session = session
+        self._device_id = device_id
+        self._jwt_token = jwt_token
+        # Request URLs and headers never change for a client, so build them once
+        self._get_headers = {
+            "Authorization": f"Bearer {jwt_token}",
+            "Host": _API_HOST,
+        }
+        self._post_headers = {
+            "Content-Type": "application/json",
+            **self._get_headers,
+        }
+        self._status_url = f"{_API_BASE_URL}/data/{device_id}/status"
+        self._command_url = f"{_API_BASE_URL}/sensor/{device_id}/commands"
+
+    async def send_command(self, command_text: str) -> dict:
+        """Send a text command to the Duux fan."""
+        try:
+            # The API expects command as a text string in the format "tune set parameter value"
+            command_data = {"command": command_text}
+            async with self._session.post(
+                self._command_url, json=command_data, headers=self._post_headers
+            ) as response:
+                if not response.ok:
+                    body = await response.text()
+                    raise DuuxApiError(f"Command failed: HTTP {response.status}: {body[:200]}")
+                
+                return await response.json()
+        except asyncio.TimeoutError as err:
+            raise DuuxApiError("Timeout connecting to Duux API") from err
+        except aiohttp.ClientError as err:
+            raise DuuxApiError(f"Error connecting to Duux API: {err}") from err
+
+    async def turn_on(self) -> None:
+        """Turn on the fan."""
+        await self.send_command(_POWER_COMMANDS[1])
+
+    async def turn_off(self) -> None:
+        """Turn off the fan."""
+        await self.send_command(_POWER_COMMANDS[0])
+
+    async def set_speed(self, speed: int) -> None:
+        """Set fan speed (1-30)."""
+        if speed not in _VALID_SPEEDS:
+            raise ValueError("Speed must be between 1 and 30")
+        # Integral floats such as 15.0 pass the set lookup but cannot index the tuple
+        await self.send_command(_SPEED_COMMANDS[int(speed)])
+
+    async def set_oscillation(self, oscillate: bool) -> None:
+        """Set horizontal oscillation."""
+        await self.send_command(_HOROSC_COMMANDS[bool(oscillate)])
+
+    async def set_mode(self, mode: int) -> None:
+        """Set fan mode."""
+        if 0 <= mode < len(_MODE_COMMANDS):
+            await self.send_command(_MODE_COMMANDS[mode])
+        else:
+            await self.send_command(f"tune set mode {mode}")
+
+    async def set_night_mode(self, night_mode: bool) -> None:
+        """Set night mode."""
+        await self.send_command(_NIGHT_COMMANDS[bool(night_mode)])
@@ -1,6 +1,10 @@
 """Common fixtures for Duux Fan integration tests."""
 from __future__ import annotations
 
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
@@ -9,38 +13,58 @@ class MockHomeAssistant:
     def __init__(self):
         self.data = {}
 
-class MockConfigEntry:
-    def __init__(self, **kwargs):
-        self.version = kwargs.get('version', 1)
-        self.minor_version = kwargs.get('minor_version', 0)
-        self.domain = kwargs.get('domain')
-        self.title = kwargs.get('title')
-        self.data = kwargs.get('data', {})
-        self.options = kwargs.get('options', {})
-        self.entry_id = kwargs.get('entry_id')
-        self.source = kwargs.get('source')
-        self.state = kwargs.get('state')
+@dataclass(frozen=True)
+class _EntryStub:
+    """Config entry stand-in exposing only what the integration reads."""
+
+    data: Mapping[str, str]
+    entry_id: str = "test_entry_id"
 
 CONF_DEVICE_ID = "device_id"
 DOMAIN = "duux"
 
 
+# Read-only, so the same payloads can be shared by every test
+_API_RESPONSES = MappingProxyType({
+    "status_success": MappingProxyType({
+        "data": MappingProxyType({
+            "power": 1,
+            "speed": 15,
+            "mode": 0,
+            "night": 0,
+            "lock": 0,
+            "horosc": 1,
+            "verosc": 0
+        })
+    }),
+    "status_off": MappingProxyType({
+        "data": MappingProxyType({
+            "power": 0,
+            "speed": 1,
+            "mode": 0,
+            "night": 0,
+            "lock": 0,
+            "horosc": 0,
+            "verosc": 0
+        })
+    }),
+    "command_success": MappingProxyType({
+        "success": True
+    }),
+    "auth_error": MappingProxyType({
+        "error": "Unauthorized",
+        "code": 401
+    }),
+})
+_DEFAULT_STATUS = _API_RESPONSES["status_success"]
+
+
 @pytest.fixture
 def mock_duux_api():
     """Mock the DuuxApiClient."""
     with patch("custom_components.duux.api.DuuxApiClient") as mock:
         api = Mock()
-        api.get_status = AsyncMock(return_value={
-            "data": {
-                "power": 1,
-                "speed": 15,
-                "mode": 0,
-                "night": 0,
-                "lock": 0,
-                "horosc": 1,
-                "verosc": 0
-            }
-        })
+        api.get_status = AsyncMock(return_value=_DEFAULT_STATUS)
         api.turn_on = AsyncMock()
         api.turn_off = AsyncMock()
         api.set_speed = AsyncMock()
@@ -52,21 +76,23 @@ def mock_duux_api():
 
 
 @pytest.fixture
+def mock_issue_registry(monkeypatch):
+    """Replace the repair issue registry calls with mocks."""
+    from homeassistant.helpers import issue_registry as ir
+
+    monkeypatch.setattr(ir, "async_create_issue", Mock())
+    monkeypatch.setattr(ir, "async_delete_issue", Mock())
+    return ir
+
+
+@pytest.fixture(scope="session")
 def mock_config_entry():
     """Mock a config entry for the integration."""
-    return MockConfigEntry(
-        version=1,
-        minor_version=0,
-        domain=DOMAIN,
-        title="Duux Fan Test",
-        data={
+    return _EntryStub(
+        data=MappingProxyType({
             CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
             "jwt_token": "test_jwt_token_12345"
-        },
-        options={},
-        entry_id="test_entry_id",
-        source="user",
-        state="loaded",
+        }),
     )
 
 
@@ -79,37 +105,52 @@ def mock_aiohttp_session():
         yield session
 
 
+class _FakeResponse:
+    """Minimal stand-in for an aiohttp response with a JSON body."""
+
+    def __init__(self, ok, payload):
+        self.ok = ok
+        self.status = 200 if ok else 400
+        self._payload = payload
+
+    async def json(self, **kwargs):
+        return self._payload
+
+    async def text(self):
+        return json.dumps(self._payload, default=dict)
+
+
+class _FakeHttpContext:
+    """Async context manager returned by session.get/post."""
+
+    def __init__(self, response):
+        self._response = response
+
+    async def __aenter__(self):
+        return self._response
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+def _make_http_context(ok, payload):
+    """Build the async context manager returned by session.get/post."""
+    return _FakeHttpContext(_FakeResponse(ok, payload))
+
+
 @pytest.fixture
+def mock_http_context():
+    """Build the async context manager returned by session.get/post."""
+    return _make_http_context
+
+
+@pytest.fixture(scope="session")
+def mock_command_context():
+    """Context manager for a successful command POST, shared by all tests."""
+    return _make_http_context(True, {"success": True})
+
+
+@pytest.fixture(scope="session")
 def mock_api_responses():
-    """Mock API response data."""
-    return {
-        "status_success": {
-            "data": {
-                "power": 1,
-                "speed": 15,
-                "mode": 0,
-                "night": 0,
-                "lock": 0,
-                "horosc": 1,
-                "verosc": 0
-            }
-        },
-        "status_off": {
-            "data": {
-                "power": 0,
-                "speed": 1,
-                "mode": 0,
-                "night": 0,
-                "lock": 0,
-                "horosc": 0,
-                "verosc": 0
-            }
-        },
-        "command_success": {
-            "success": True
-        },
-        "auth_error": {
-            "error": "Unauthorized",
-            "code": 401
-        }
-    }
\ No newline at end of file
+    """Mock API response data, shared read-only by the whole session."""
+    return _API_RESPONSES
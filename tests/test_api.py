@@ -25,100 +25,202 @@ class TestDuuxApiClient:
         assert api_client._jwt_token == "test_token"
         assert api_client._session is not None
 
-    async def test_get_status_success(self, api_client, mock_api_responses):
+    async def test_close_keeps_shared_session(self, api_client):
+        """Test closing the client leaves a passed-in session open."""
+        api_client._session.close = AsyncMock()
+
+        async with api_client:
+            pass
+
+        api_client._session.close.assert_not_called()
+
+    async def test_close_owned_session(self):
+        """Test the client closes a session it opened itself."""
+        session = Mock()
+        session.close = AsyncMock()
+
+        with patch("custom_components.duux.api.aiohttp.ClientSession", return_value=session):
+            async with DuuxApiClient(None, "34:5f:45:ec:b8:34", "test_token") as client:
+                assert client._session is session
+
+        session.close.assert_awaited_once()
+
+    async def test_get_status_success(self, api_client, mock_api_responses, mock_http_context):
         """Test successful status request."""
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value=mock_api_responses["status_success"])
-        
-        api_client._session.get = AsyncMock()
-        api_client._session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        api_client._session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+        api_client._session.get = Mock(
+            return_value=mock_http_context(True, mock_api_responses["status_success"])
+        )
 
         result = await api_client.get_status()
         
         assert result == mock_api_responses["status_success"]
         api_client._session.get.assert_called_once()
 
-    async def test_get_status_auth_error(self, api_client, mock_api_responses):
+    async def test_get_status_auth_error(self, api_client, mock_api_responses, mock_http_context):
         """Test status request with authentication error."""
-        mock_response = Mock()
-        mock_response.ok = False
-        mock_response.json = AsyncMock(return_value=mock_api_responses["auth_error"])
-        
-        api_client._session.get = AsyncMock()
-        api_client._session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        api_client._session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+        api_client._session.get = Mock(
+            return_value=mock_http_context(False, mock_api_responses["auth_error"])
+        )
 
-        with pytest.raises(DuuxApiError, match="Status request failed"):
+        with pytest.raises(DuuxApiError, match="Status request failed: HTTP 400"):
             await api_client.get_status()
 
     async def test_get_status_timeout(self, api_client):
         """Test status request timeout."""
-        api_client._session.get = AsyncMock(side_effect=asyncio.TimeoutError())
+        api_client._session.get = Mock(side_effect=asyncio.TimeoutError())
 
         with pytest.raises(DuuxApiError, match="Timeout connecting to Duux API"):
             await api_client.get_status()
 
     async def test_get_status_client_error(self, api_client):
         """Test status request with client error."""
-        api_client._session.get = AsyncMock(side_effect=aiohttp.ClientError("Connection failed"))
+        api_client._session.get = Mock(side_effect=aiohttp.ClientError("Connection failed"))
 
         with pytest.raises(DuuxApiError, match="Error connecting to Duux API"):
             await api_client.get_status()
 
-    async def test_send_command_success(self, api_client, mock_api_responses):
+    async def test_get_status_cached(self, api_client, mock_api_responses, mock_http_context):
+        """Test repeated status requests within the TTL share one request."""
+        api_client._session.get = Mock(
+            return_value=mock_http_context(True, mock_api_responses["status_success"])
+        )
+
+        first = await api_client.get_status()
+        second = await api_client.get_status()
+
+        assert first == second == mock_api_responses["status_success"]
+        api_client._session.get.assert_called_once()
+
+    async def test_send_command_invalidates_status_cache(self, api_client, mock_api_responses, mock_http_context):
+        """Test a successful command forces the next status request."""
+        api_client._session.get = Mock(
+            return_value=mock_http_context(True, mock_api_responses["status_success"])
+        )
+        api_client._session.post = Mock(
+            return_value=mock_http_context(True, mock_api_responses["status_success"])
+        )
+
+        await api_client.get_status()
+        await api_client.send_command("tune set power 1")
+        await api_client.get_status()
+
+        assert api_client._session.get.call_count == 2
+
+    async def test_expire_status_cache(self, api_client, mock_api_responses, mock_http_context):
+        """Test an expired cache makes the next status request reach the device."""
+        api_client._session.get = Mock(
+            return_value=mock_http_context(True, mock_api_responses["status_success"])
+        )
+
+        await api_client.get_status()
+        api_client.expire_status_cache()
+        await api_client.get_status()
+
+        assert api_client._session.get.call_count == 2
+
+    async def test_send_command_success(self, api_client, mock_api_responses, mock_http_context):
         """Test successful command sending."""
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value=mock_api_responses["command_success"])
-        
-        api_client._session.post = AsyncMock()
-        api_client._session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        api_client._session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        api_client._session.post = Mock(
+            return_value=mock_http_context(True, mock_api_responses["command_success"])
+        )
 
-        command = {"power": 1}
-        result = await api_client.send_command(command)
+        result = await api_client.send_command("tune set power 1")
         
         assert result == mock_api_responses["command_success"]
         api_client._session.post.assert_called_once()
+        assert api_client._session.post.call_args[1]["data"] == b'{"command":"tune set power 1"}'
 
-    async def test_send_command_error(self, api_client, mock_api_responses):
+    async def test_send_command_error(self, api_client, mock_api_responses, mock_http_context):
         """Test command sending with error response."""
-        mock_response = Mock()
-        mock_response.ok = False
-        mock_response.json = AsyncMock(return_value=mock_api_responses["auth_error"])
-        
-        api_client._session.post = AsyncMock()
-        api_client._session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        api_client._session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        api_client._session.post = Mock(
+            return_value=mock_http_context(False, mock_api_responses["auth_error"])
+        )
 
         with pytest.raises(DuuxApiError, match="Command failed"):
-            await api_client.send_command({"power": 1})
+            await api_client.send_command("tune set power 1")
+
+    async def test_send_command_coalesces_concurrent_calls(self, api_client, mock_api_responses, mock_http_context):
+        """Test identical commands in flight at once share one request."""
+        api_client._session.post = Mock(
+            return_value=mock_http_context(True, mock_api_responses["command_success"])
+        )
+
+        results = await asyncio.gather(
+            *(api_client.send_command("tune set power 1") for _ in range(10))
+        )
+
+        assert results == [mock_api_responses["command_success"]] * 10
+        api_client._session.post.assert_called_once()
+        assert api_client._inflight is None
+
+    async def test_send_command_sequential_calls_not_coalesced(self, api_client, mock_api_responses, mock_http_context):
+        """Test a command sent after the previous one finished is sent again."""
+        api_client._session.post = Mock(
+            return_value=mock_http_context(True, mock_api_responses["command_success"])
+        )
+
+        await api_client.send_command("tune set power 1")
+        await api_client.send_command("tune set power 1")
+
+        assert api_client._session.post.call_count == 2
+
+    async def test_send_command_interleaved_calls_not_coalesced(self, api_client, mock_api_responses, mock_http_context):
+        """Test a command repeated after a different one is sent again, in order."""
+        api_client._session.post = Mock(
+            return_value=mock_http_context(True, mock_api_responses["command_success"])
+        )
+
+        await asyncio.gather(
+            api_client.send_command("tune set power 1"),
+            api_client.send_command("tune set power 0"),
+            api_client.send_command("tune set power 1"),
+        )
 
-    async def test_turn_on(self, api_client):
+        assert [
+            kwargs["data"] for _, kwargs in api_client._session.post.call_args_list
+        ] == [
+            b'{"command":"tune set power 1"}',
+            b'{"command":"tune set power 0"}',
+            b'{"command":"tune set power 1"}',
+        ]
+        assert api_client._inflight is None
+
+    async def test_turn_on(self, api_client, monkeypatch):
         """Test turn on command."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.turn_on()
         
-        api_client.send_command.assert_called_once_with({"power": 1})
+        api_client.send_command.assert_called_once_with("tune set power 1")
 
-    async def test_turn_off(self, api_client):
+    async def test_turn_off(self, api_client, monkeypatch):
         """Test turn off command."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.turn_off()
         
-        api_client.send_command.assert_called_once_with({"power": 0})
+        api_client.send_command.assert_called_once_with("tune set power 0")
 
-    async def test_set_speed_valid(self, api_client):
+    async def test_set_speed_valid(self, api_client, monkeypatch):
         """Test setting valid speed."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.set_speed(15)
         
-        api_client.send_command.assert_called_once_with({"speed": 15})
+        api_client.send_command.assert_called_once_with("tune set speed 15")
+
+    async def test_set_speed_integral_float(self, api_client, monkeypatch):
+        """Test an integral float speed is sent as an integer speed."""
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
+
+        await api_client.set_speed(15.0)
+
+        api_client.send_command.assert_called_once_with("tune set speed 15")
+
+    async def test_set_speed_fractional(self, api_client):
+        """Test a fractional speed is rejected."""
+        with pytest.raises(ValueError, match="Speed must be between 1 and 30"):
+            await api_client.set_speed(15.5)
 
     async def test_set_speed_invalid_low(self, api_client):
         """Test setting speed too low."""
@@ -130,42 +232,34 @@ class TestDuuxApiClient:
         with pytest.raises(ValueError, match="Speed must be between 1 and 30"):
             await api_client.set_speed(31)
 
-    async def test_set_oscillation_on(self, api_client):
+    async def test_set_oscillation_on(self, api_client, monkeypatch):
         """Test enabling oscillation."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.set_oscillation(True)
         
-        api_client.send_command.assert_called_once_with({"horosc": 1})
+        api_client.send_command.assert_called_once_with("tune set horosc 1")
 
-    async def test_set_oscillation_off(self, api_client):
+    async def test_set_oscillation_off(self, api_client, monkeypatch):
         """Test disabling oscillation."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.set_oscillation(False)
         
-        api_client.send_command.assert_called_once_with({"horosc": 0})
-
-    async def test_set_mode(self, api_client):
-        """Test setting fan mode."""
-        api_client.send_command = AsyncMock()
-        
-        await api_client.set_mode(2)
-        
-        api_client.send_command.assert_called_once_with({"mode": 2})
+        api_client.send_command.assert_called_once_with("tune set horosc 0")
 
-    async def test_set_night_mode_on(self, api_client):
+    async def test_set_night_mode_on(self, api_client, monkeypatch):
         """Test enabling night mode."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.set_night_mode(True)
         
-        api_client.send_command.assert_called_once_with({"night": 1})
+        api_client.send_command.assert_called_once_with("tune set night 1")
 
-    async def test_set_night_mode_off(self, api_client):
+    async def test_set_night_mode_off(self, api_client, monkeypatch):
         """Test disabling night mode."""
-        api_client.send_command = AsyncMock()
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
         await api_client.set_night_mode(False)
         
-        api_client.send_command.assert_called_once_with({"night": 0})
\ No newline at end of file
+        api_client.send_command.assert_called_once_with("tune set night 0")
\ No newline at end of file
@@ -0,0 +1,320 @@
+"""Tests for the command payloads built by the standalone Duux API clients."""
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+import pytest
+import aiohttp
+import orjson
+
+from tests._duux_client_fixtures import (
+    DuuxApiClient,
+    DuuxApiError,
+    TextCommandApiClient,
+)
+
+# Transport errors raised by the mocked session, built once for the module
+_TIMEOUT = asyncio.TimeoutError("Request timed out")
+_CLIENT_ERR = aiohttp.ClientError("Connection failed")
+
+
+def _recording_post(context, log):
+    """Build a session.post replacement that records its calls in log."""
+
+    def post(*args, **kwargs):
+        log.append((args, kwargs))
+        return context
+
+    return post
+
+
+@pytest.fixture
+def post_log():
+    """Collect the (args, kwargs) of every command POST."""
+    return []
+
+
+@pytest.fixture
+def api_client(request, mock_command_context, post_log):
+    """Create an API client whose command requests succeed.
+
+    The dict command client is used unless a test parametrizes the client
+    class indirectly.
+    """
+    client_class = getattr(request, "param", DuuxApiClient)
+    # Tests that need session.get install their own Mock
+    session = SimpleNamespace(
+        post=_recording_post(mock_command_context, post_log), get=None
+    )
+    return client_class(session, "34:5f:45:ec:b8:34", "test_token")
+
+
+class TestDuuxApiClientComprehensive:
+    """Comprehensive test suite for the DuuxApiClient."""
+
+    async def test_get_status_timeout_error(self, api_client):
+        """Test status request timeout."""
+        api_client._session.get = Mock(side_effect=_TIMEOUT)
+        
+        with pytest.raises(DuuxApiError, match="Timeout connecting to Duux API"):
+            await api_client.get_status()
+
+    async def test_get_status_client_error(self, api_client):
+        """Test status request with client error."""
+        api_client._session.get = Mock(side_effect=_CLIENT_ERR)
+        
+        with pytest.raises(DuuxApiError, match="Error connecting to Duux API"):
+            await api_client.get_status()
+
+    async def test_send_command_timeout_error(self, api_client):
+        """Test command sending timeout."""
+        api_client._session.post = Mock(side_effect=_TIMEOUT)
+        
+        with pytest.raises(DuuxApiError, match="Timeout connecting to Duux API"):
+            await api_client.send_command({"power": 1})
+
+    async def test_send_command_client_error(self, api_client):
+        """Test command sending with client error."""
+        api_client._session.post = Mock(side_effect=_CLIENT_ERR)
+        
+        with pytest.raises(DuuxApiError, match="Error connecting to Duux API"):
+            await api_client.send_command({"power": 1})
+
+    @pytest.mark.parametrize("speed", range(1, 31))
+    async def test_all_speed_values(self, api_client, speed):
+        """Test all valid speed values from 1 to 30."""
+        api_client.send_command = AsyncMock()
+
+        await api_client.set_speed(speed)
+
+        api_client.send_command.assert_called_once_with({"speed": speed})
+
+    @pytest.mark.parametrize("bad_speed", [0, -5, 31, 100])
+    async def test_invalid_speed(self, api_client, bad_speed):
+        """Test speed values outside 1-30 are rejected."""
+        with pytest.raises(ValueError, match="Speed must be between 1 and 30"):
+            await api_client.set_speed(bad_speed)
+
+    async def test_get_status_request_shape(self, api_client, mock_http_context):
+        """Test the status request URL and headers."""
+        api_client._session.get = Mock(return_value=mock_http_context(True, {"data": {}}))
+        
+        await api_client.get_status()
+        
+        args, kwargs = api_client._session.get.call_args
+        url = args[0]
+        headers = kwargs["headers"]
+        # The device ID is in the URL
+        assert "/data/34:5f:45:ec:b8:34/status" in url
+        # The JWT token and Host header are included
+        assert headers["Authorization"] == "Bearer test_token"
+        assert headers["Host"] == "v5.api.cloudgarden.nl"
+
+    async def test_command_structure(self, api_client, post_log):
+        """Test that commands are properly structured."""
+        command = {"power": 1, "speed": 15}
+        await api_client.send_command(command)
+        
+        # Check that the command is properly wrapped and JSON serialized
+        json_data = post_log[-1][1]["json"]
+        expected_command_string = json.dumps(command)
+        assert json_data == {"command": expected_command_string}
+
+    @pytest.mark.parametrize(("oscillate", "value"), [(True, 1), (False, 0)])
+    async def test_boolean_conversion_oscillation(self, api_client, oscillate, value):
+        """Test boolean conversion for oscillation commands."""
+        api_client.send_command = AsyncMock()
+
+        await api_client.set_oscillation(oscillate)
+
+        api_client.send_command.assert_called_once_with({"horosc": value})
+
+    @pytest.mark.parametrize(("night_mode", "value"), [(True, 1), (False, 0)])
+    async def test_boolean_conversion_night_mode(self, api_client, night_mode, value):
+        """Test boolean conversion for night mode commands."""
+        api_client.send_command = AsyncMock()
+
+        await api_client.set_night_mode(night_mode)
+
+        api_client.send_command.assert_called_once_with({"night": value})
+
+    @pytest.mark.parametrize("mode", [0, 1, 2, 3])
+    async def test_mode_values(self, api_client, mode):
+        """Test different mode values."""
+        api_client.send_command = AsyncMock()
+
+        await api_client.set_mode(mode)
+
+        api_client.send_command.assert_called_once_with({"mode": mode})
+
+
+class TestDuuxApiFix:
+    """Test the specific API fix for command structure."""
+
+    # Expected request bodies, shared by every test in the class
+    _EXPECTED_TURN_OFF = {"command": '{"power": 0}'}
+    _EXPECTED_TURN_ON = {"command": '{"power": 1}'}
+
+    async def test_command_json_serialization(self, api_client, post_log):
+        """Test that commands are JSON serialized as strings."""
+        # Test with a power off command
+        command = {"power": 0}
+        await api_client.send_command(command)
+        
+        # Verify the exact structure sent to the API
+        json_data = post_log[-1][1]["json"]
+        
+        # The command should be JSON serialized as a string
+        assert json_data == self._EXPECTED_TURN_OFF
+        
+        # Verify it's actually a string, not an object
+        assert isinstance(json_data["command"], str)
+        
+        # Verify we can parse it back to the original command
+        parsed_command = orjson.loads(json_data["command"])
+        assert parsed_command == command
+
+    async def test_complex_command_serialization(self, api_client, post_log):
+        """Test serialization of complex commands."""
+        # Test with a complex command
+        command = {
+            "power": 1,
+            "speed": 25,
+            "horosc": 1,
+            "mode": 2,
+            "night": 0
+        }
+        await api_client.send_command(command)
+        
+        # Verify the structure
+        json_data = post_log[-1][1]["json"]
+        
+        # Verify it's properly serialized
+        assert isinstance(json_data["command"], str)
+        parsed_command = orjson.loads(json_data["command"])
+        assert parsed_command == command
+
+    async def test_turn_off_command_structure(self, api_client, post_log):
+        """Test the specific turn off command that was failing."""
+        # Test the turn_off method specifically
+        await api_client.turn_off()
+        
+        # Verify the exact structure sent
+        json_data = post_log[-1][1]["json"]
+        
+        # Should be: {"command": "{\"power\": 0}"}
+        assert json_data == self._EXPECTED_TURN_OFF
+        
+        # Double-check it's a string
+        assert isinstance(json_data["command"], str)
+        
+        # Verify the parsed content
+        parsed_command = orjson.loads(json_data["command"])
+        assert parsed_command == {"power": 0}
+
+    async def test_turn_on_command_structure(self, api_client, post_log):
+        """Test the turn on command structure."""
+        # Test the turn_on method
+        await api_client.turn_on()
+        
+        # Verify the structure
+        json_data = post_log[-1][1]["json"]
+        
+        # Should be: {"command": "{\"power\": 1}"}
+        assert json_data == self._EXPECTED_TURN_ON
+        
+        parsed_command = orjson.loads(json_data["command"])
+        assert parsed_command == {"power": 1}
+
+
+@pytest.mark.parametrize(
+    "api_client", [TextCommandApiClient], ids=["text_cmd"], indirect=True
+)
+class TestCorrectDuuxApiClient:
+    """Test the corrected Duux API client with text commands."""
+
+    async def test_turn_on_command_format(self, api_client, post_log):
+        """Test turn on sends the correct text command."""
+        await api_client.turn_on()
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set power 1"}
+
+    async def test_turn_off_command_format(self, api_client, post_log):
+        """Test turn off sends the correct text command."""
+        await api_client.turn_off()
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set power 0"}
+
+    async def test_set_speed_command_format(self, api_client, post_log):
+        """Test set speed sends the correct text command."""
+        await api_client.set_speed(15)
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set speed 15"}
+
+    async def test_set_oscillation_on_command_format(self, api_client, post_log):
+        """Test oscillation on sends the correct text command."""
+        await api_client.set_oscillation(True)
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set horosc 1"}
+
+    async def test_set_oscillation_off_command_format(self, api_client, post_log):
+        """Test oscillation off sends the correct text command."""
+        await api_client.set_oscillation(False)
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set horosc 0"}
+
+    async def test_set_mode_command_format(self, api_client, post_log):
+        """Test mode setting sends the correct text command."""
+        await api_client.set_mode(2)
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set mode 2"}
+
+    async def test_set_night_mode_on_command_format(self, api_client, post_log):
+        """Test night mode on sends the correct text command."""
+        await api_client.set_night_mode(True)
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set night 1"}
+
+    async def test_set_night_mode_off_command_format(self, api_client, post_log):
+        """Test night mode off sends the correct text command."""
+        await api_client.set_night_mode(False)
+        
+        # Verify the exact command format
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": "tune set night 0"}
+
+    async def test_speed_validation(self, api_client):
+        """Test speed validation still works."""
+        with pytest.raises(ValueError, match="Speed must be between 1 and 30"):
+            await api_client.set_speed(0)
+        
+        with pytest.raises(ValueError, match="Speed must be between 1 and 30"):
+            await api_client.set_speed(31)
+
+    @pytest.mark.parametrize("speed", [1, 15, 30])
+    async def test_all_valid_speeds(self, api_client, post_log, speed):
+        """Test key speed values generate correct commands."""
+        await api_client.set_speed(speed)
+
+        json_data = post_log[-1][1]["json"]
+        assert json_data == {"command": f"tune set speed {speed}"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
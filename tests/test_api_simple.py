@@ -1,25 +1,34 @@
 """Simplified tests for the Duux API client without Home Assistant dependencies."""
 from __future__ import annotations
 
-import asyncio
-import sys
-import os
 from unittest.mock import AsyncMock, Mock
+import aiohttp
 import pytest
 
-# Add the parent directory to the path so we can import our modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from custom_components.duux.api import DuuxApiClient, DuuxApiError
 
+# (client method, arguments, command expected by send_command)
+_COMMAND_CASES = [
+    pytest.param("turn_on", (), "tune set power 1", id="turn_on"),
+    pytest.param("turn_off", (), "tune set power 0", id="turn_off"),
+    pytest.param("set_speed", (15,), "tune set speed 15", id="speed"),
+    pytest.param("set_oscillation", (True,), "tune set horosc 1", id="oscillation_on"),
+    pytest.param("set_oscillation", (False,), "tune set horosc 0", id="oscillation_off"),
+    pytest.param("set_night_mode", (True,), "tune set night 1", id="night_mode_on"),
+    pytest.param("set_night_mode", (False,), "tune set night 0", id="night_mode_off"),
+]
+
 
-@pytest.mark.asyncio
 class TestDuuxApiClientSimple:
     """Simplified test for the DuuxApiClient."""
 
+    # Attribute names of a real session, resolved once for the whole class
+    _SESSION_SPEC = dir(aiohttp.ClientSession)
+
     def setup_method(self):
         """Set up test fixtures."""
-        self.session = Mock()
+        # Unknown session attributes raise instead of silently becoming mocks
+        self.session = Mock(spec=self._SESSION_SPEC)
         self.api_client = DuuxApiClient(self.session, "34:5f:45:ec:b8:34", "test_token")
 
     async def test_init(self):
@@ -28,29 +37,14 @@ class TestDuuxApiClientSimple:
         assert self.api_client._jwt_token == "test_token"
         assert self.api_client._session is not None
 
-    async def test_turn_on_calls_send_command(self):
-        """Test turn on calls send_command with correct parameters."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.turn_on()
-        
-        self.api_client.send_command.assert_called_once_with({"power": 1})
-
-    async def test_turn_off_calls_send_command(self):
-        """Test turn off calls send_command with correct parameters."""
-        self.api_client.send_command = AsyncMock()
+    @pytest.mark.parametrize(("method", "args", "expected"), _COMMAND_CASES)
+    async def test_command_dispatch(self, monkeypatch, method, args, expected):
+        """Test each setter calls send_command with the expected command."""
+        monkeypatch.setattr(DuuxApiClient, "send_command", AsyncMock())
         
-        await self.api_client.turn_off()
+        await getattr(self.api_client, method)(*args)
         
-        self.api_client.send_command.assert_called_once_with({"power": 0})
-
-    async def test_set_speed_valid(self):
-        """Test setting valid speed."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.set_speed(15)
-        
-        self.api_client.send_command.assert_called_once_with({"speed": 15})
+        self.api_client.send_command.assert_called_once_with(expected)
 
     async def test_set_speed_invalid_low(self):
         """Test setting speed too low raises ValueError."""
@@ -62,47 +56,7 @@ class TestDuuxApiClientSimple:
         with pytest.raises(ValueError, match="Speed must be between 1 and 30"):
             await self.api_client.set_speed(31)
 
-    async def test_set_oscillation_on(self):
-        """Test enabling oscillation."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.set_oscillation(True)
-        
-        self.api_client.send_command.assert_called_once_with({"horosc": 1})
-
-    async def test_set_oscillation_off(self):
-        """Test disabling oscillation."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.set_oscillation(False)
-        
-        self.api_client.send_command.assert_called_once_with({"horosc": 0})
-
-    async def test_set_mode(self):
-        """Test setting fan mode."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.set_mode(2)
-        
-        self.api_client.send_command.assert_called_once_with({"mode": 2})
-
-    async def test_set_night_mode_on(self):
-        """Test enabling night mode."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.set_night_mode(True)
-        
-        self.api_client.send_command.assert_called_once_with({"night": 1})
-
-    async def test_set_night_mode_off(self):
-        """Test disabling night mode."""
-        self.api_client.send_command = AsyncMock()
-        
-        await self.api_client.set_night_mode(False)
-        
-        self.api_client.send_command.assert_called_once_with({"night": 0})
-
-    async def test_get_status_success(self):
+    async def test_get_status_success(self, mock_http_context):
         """Test successful status request."""
         expected_response = {
             "data": {
@@ -113,66 +67,34 @@ class TestDuuxApiClientSimple:
             }
         }
         
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value=expected_response)
-        
-        self.api_client._session.get = AsyncMock()
-        self.api_client._session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        self.api_client._session.get.return_value.__aexit__ = AsyncMock(return_value=None)
+        self.api_client._session.get = Mock(
+            return_value=mock_http_context(True, expected_response)
+        )
 
         result = await self.api_client.get_status()
         
         assert result == expected_response
         self.api_client._session.get.assert_called_once()
 
-    async def test_send_command_success(self):
+    async def test_send_command_success(self, mock_command_context):
         """Test successful command sending."""
         expected_response = {"success": True}
         
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value=expected_response)
-        
-        self.api_client._session.post = AsyncMock()
-        self.api_client._session.post.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        self.api_client._session.post.return_value.__aexit__ = AsyncMock(return_value=None)
+        self.api_client._session.post = Mock(return_value=mock_command_context)
 
-        command = {"power": 1}
-        result = await self.api_client.send_command(command)
+        result = await self.api_client.send_command("tune set power 1")
         
         assert result == expected_response
         self.api_client._session.post.assert_called_once()
 
-
-if __name__ == "__main__":
-    # Run a simple test
-    async def run_simple_test():
-        test_instance = TestDuuxApiClientSimple()
-        test_instance.setup_method()
+    async def test_send_command_error_response(self, mock_http_context):
+        """Test command sending with error response."""
+        error_response = {"error": "Unauthorized", "code": 401}
         
-        try:
-            await test_instance.test_init()
-            print("✓ test_init passed")
-            
-            await test_instance.test_turn_on_calls_send_command()
-            print("✓ test_turn_on_calls_send_command passed")
-            
-            await test_instance.test_set_speed_valid()
-            print("✓ test_set_speed_valid passed")
-            
-            try:
-                await test_instance.test_set_speed_invalid_low()
-                print("✗ test_set_speed_invalid_low failed - should have raised ValueError")
-            except ValueError:
-                print("✓ test_set_speed_invalid_low passed")
-            
-            print("\nAll basic tests passed!")
-            
-        except Exception as e:
-            print(f"✗ Test failed: {e}")
-            import traceback
-            traceback.print_exc()
-
-    # Run the simple test
-    asyncio.run(run_simple_test())
\ No newline at end of file
+        self.api_client._session.post = Mock(
+            return_value=mock_http_context(False, error_response)
+        )
+
+        with pytest.raises(DuuxApiError, match="Command failed"):
+            await self.api_client.send_command("tune set power 1")
+
@@ -1,34 +1,53 @@
 """Tests for the Duux config flow."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, Mock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 import pytest
-from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.const import CONF_DEVICE_ID
 
-from custom_components.duux.config_flow import ConfigFlow, CannotConnect, InvalidAuth
+from custom_components.duux.api import DuuxApiError
+from custom_components.duux.config_flow import (
+    CannotConnect,
+    ConfigFlow,
+    InvalidAuth,
+    validate_input,
+)
 from custom_components.duux.const import DOMAIN
 
 
+@pytest.fixture(scope="module")
+def mock_hass():
+    """Mock Home Assistant, shared read-only by every test in the module."""
+    return SimpleNamespace(data=MappingProxyType({}))
+
+
 @pytest.mark.unit
+@pytest.mark.xdist_group("config_flow")
 class TestConfigFlow:
     """Test the config flow."""
 
-    @pytest.fixture
-    def mock_hass(self):
-        """Mock Home Assistant."""
-        hass = Mock(spec=HomeAssistant)
-        hass.data = {}
-        return hass
-
     @pytest.fixture
     def config_flow(self, mock_hass):
         """Create a config flow for testing."""
         flow = ConfigFlow()
         flow.hass = mock_hass
+        # The unique ID checks look up other flows and entries through
+        # hass.config_entries, which this bare hass does not provide
+        flow.async_set_unique_id = AsyncMock()
+        flow._abort_if_unique_id_configured = Mock()
         return flow
 
+    @pytest.fixture
+    def mock_validate(self, monkeypatch):
+        """Replace validate_input for the duration of a test."""
+        validate = AsyncMock()
+        monkeypatch.setattr(
+            "custom_components.duux.config_flow.validate_input", validate
+        )
+        return validate
+
     async def test_form_user_step(self, config_flow):
         """Test the user step shows the form."""
         result = await config_flow.async_step_user()
@@ -37,68 +56,46 @@ class TestConfigFlow:
         assert result["step_id"] == "user"
         assert result["errors"] == {}
 
-    async def test_form_user_success(self, config_flow, mock_aiohttp_session):
+    async def test_form_user_success(self, config_flow, mock_validate, mock_aiohttp_session):
         """Test successful configuration."""
         user_input = {
             CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
             "jwt_token": "test_token_12345"
         }
         
-        with patch("custom_components.duux.config_flow.validate_input") as mock_validate:
-            mock_validate.return_value = {"title": "Duux Fan (34:5f:45:ec:b8:34)"}
-            
-            result = await config_flow.async_step_user(user_input)
+        mock_validate.return_value = {"title": "Duux Fan (34:5f:45:ec:b8:34)"}
+        
+        result = await config_flow.async_step_user(user_input)
         
         assert result["type"] == FlowResultType.CREATE_ENTRY
         assert result["title"] == "Duux Fan (34:5f:45:ec:b8:34)"
         assert result["data"] == user_input
-
-    async def test_form_user_cannot_connect(self, config_flow):
-        """Test cannot connect error."""
+        config_flow.async_set_unique_id.assert_called_once_with("34:5f:45:ec:b8:34")
+
+    @pytest.mark.parametrize(
+        ("error", "expected"),
+        [
+            (CannotConnect(), "cannot_connect"),
+            (InvalidAuth(), "invalid_auth"),
+            (Exception("Unexpected error"), "unknown"),
+        ],
+        ids=["cannot_connect", "invalid_auth", "unknown"],
+    )
+    async def test_form_user_errors(self, config_flow, mock_validate, error, expected):
+        """Test validation errors are shown on the form."""
         user_input = {
             CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
             "jwt_token": "test_token_12345"
         }
         
-        with patch("custom_components.duux.config_flow.validate_input") as mock_validate:
-            mock_validate.side_effect = CannotConnect()
-            
-            result = await config_flow.async_step_user(user_input)
+        mock_validate.side_effect = error
         
-        assert result["type"] == FlowResultType.FORM
-        assert result["errors"] == {"base": "cannot_connect"}
-
-    async def test_form_user_invalid_auth(self, config_flow):
-        """Test invalid auth error."""
-        user_input = {
-            CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
-            "jwt_token": "invalid_token"
-        }
-        
-        with patch("custom_components.duux.config_flow.validate_input") as mock_validate:
-            mock_validate.side_effect = InvalidAuth()
-            
-            result = await config_flow.async_step_user(user_input)
+        result = await config_flow.async_step_user(user_input)
         
         assert result["type"] == FlowResultType.FORM
-        assert result["errors"] == {"base": "invalid_auth"}
+        assert result["errors"] == {"base": expected}
 
-    async def test_form_user_unknown_error(self, config_flow):
-        """Test unknown error."""
-        user_input = {
-            CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
-            "jwt_token": "test_token_12345"
-        }
-        
-        with patch("custom_components.duux.config_flow.validate_input") as mock_validate:
-            mock_validate.side_effect = Exception("Unexpected error")
-            
-            result = await config_flow.async_step_user(user_input)
-        
-        assert result["type"] == FlowResultType.FORM
-        assert result["errors"] == {"base": "unknown"}
-
-    async def test_form_user_already_configured(self, config_flow):
+    async def test_form_user_already_configured(self, config_flow, monkeypatch):
         """Test device already configured."""
         user_input = {
             CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
@@ -106,60 +103,57 @@ class TestConfigFlow:
         }
         
         # Mock that the device is already configured
-        with patch.object(config_flow, "async_set_unique_id"):
-            with patch.object(config_flow, "_abort_if_unique_id_configured") as mock_abort:
-                mock_abort.side_effect = Exception("Already configured")
-                
-                with pytest.raises(Exception, match="Already configured"):
-                    await config_flow.async_step_user(user_input)
+        monkeypatch.setattr(config_flow, "async_set_unique_id", AsyncMock())
+        monkeypatch.setattr(
+            config_flow,
+            "_abort_if_unique_id_configured",
+            Mock(side_effect=Exception("Already configured")),
+        )
+        
+        with pytest.raises(Exception, match="Already configured"):
+            await config_flow.async_step_user(user_input)
 
 
 @pytest.mark.unit
+@pytest.mark.xdist_group("config_flow")
 class TestValidateInput:
     """Test the validate_input function."""
 
-    async def test_validate_input_success(self, mock_aiohttp_session, mock_api_responses):
+    @pytest.fixture
+    def mock_api(self, monkeypatch, mock_aiohttp_session):
+        """Replace the session helper and API client used by validate_input."""
+        api = Mock()
+        monkeypatch.setattr(
+            "custom_components.duux.config_flow.async_get_clientsession",
+            Mock(return_value=mock_aiohttp_session),
+        )
+        monkeypatch.setattr(
+            "custom_components.duux.config_flow.DuuxApiClient",
+            Mock(return_value=api),
+        )
+        return api
+
+    async def test_validate_input_success(self, mock_hass, mock_api, mock_api_responses):
         """Test successful validation."""
-        from custom_components.duux.config_flow import validate_input
-        
         data = {
             CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
             "jwt_token": "test_token_12345"
         }
         
-        mock_hass = Mock()
+        mock_api.get_status = AsyncMock(return_value=mock_api_responses["status_success"])
         
-        with patch("custom_components.duux.config_flow.async_get_clientsession") as mock_session:
-            mock_session.return_value = mock_aiohttp_session
-            
-            with patch("custom_components.duux.config_flow.DuuxApiClient") as mock_api_class:
-                mock_api = Mock()
-                mock_api.get_status = AsyncMock(return_value=mock_api_responses["status_success"])
-                mock_api_class.return_value = mock_api
-                
-                result = await validate_input(mock_hass, data)
+        result = await validate_input(mock_hass, data)
         
         assert result == {"title": f"Duux Fan ({data[CONF_DEVICE_ID]})"}
 
-    async def test_validate_input_api_error(self, mock_aiohttp_session):
+    async def test_validate_input_api_error(self, mock_hass, mock_api):
         """Test validation with API error."""
-        from custom_components.duux.config_flow import validate_input, InvalidAuth
-        from custom_components.duux.api import DuuxApiError
-        
         data = {
             CONF_DEVICE_ID: "34:5f:45:ec:b8:34",
             "jwt_token": "invalid_token"
         }
         
-        mock_hass = Mock()
+        mock_api.get_status = AsyncMock(side_effect=DuuxApiError("401 Unauthorized"))
         
-        with patch("custom_components.duux.config_flow.async_get_clientsession") as mock_session:
-            mock_session.return_value = mock_aiohttp_session
-            
-            with patch("custom_components.duux.config_flow.DuuxApiClient") as mock_api_class:
-                mock_api = Mock()
-                mock_api.get_status = AsyncMock(side_effect=DuuxApiError("401 Unauthorized"))
-                mock_api_class.return_value = mock_api
-                
-                with pytest.raises(InvalidAuth):
-                    await validate_input(mock_hass, data)
\ No newline at end of file
+        with pytest.raises(InvalidAuth):
+            await validate_input(mock_hass, data)
@@ -1,50 +1,61 @@
 """Tests for the Duux data update coordinator."""
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 import pytest
-from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from custom_components.duux.coordinator import DuuxDataUpdateCoordinator
-from custom_components.duux.api import DuuxApiError
-from custom_components.duux.const import DOMAIN, REPAIR_ISSUE_AUTH_FAILED
+from custom_components.duux.api import DuuxApiClient, DuuxApiError
+from custom_components.duux.const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    REPAIR_ISSUE_AUTH_FAILED,
+)
 
 
 @pytest.mark.unit
+@pytest.mark.usefixtures("mock_issue_registry")
 class TestDuuxDataUpdateCoordinator:
     """Test the DuuxDataUpdateCoordinator."""
 
     @pytest.fixture
-    def mock_hass(self):
-        """Mock Home Assistant."""
-        hass = Mock(spec=HomeAssistant)
-        hass.data = {}
-        return hass
-
-    @pytest.fixture
-    def mock_session(self):
-        """Mock aiohttp session."""
-        return Mock()
-
-    @pytest.fixture
-    def coordinator(self, mock_hass, mock_session, mock_duux_api):
+    def coordinator(self, mock_duux_api):
         """Create a coordinator for testing."""
         with patch("custom_components.duux.coordinator.DuuxApiClient") as mock_api_class:
             mock_api_class.return_value = mock_duux_api
-            coord = DuuxDataUpdateCoordinator(
-                mock_hass,
-                mock_session,
+            return DuuxDataUpdateCoordinator(
+                SimpleNamespace(data={}),
+                Mock(),
                 "34:5f:45:ec:b8:34",
                 "test_token"
             )
-            return coord
+
+    @pytest.fixture
+    def listeners(self, coordinator, monkeypatch):
+        """Record coordinator listeners and count refreshes instead of running them."""
+        registered = []
+
+        def add_listener(update_callback):
+            registered.append(update_callback)
+            return lambda: registered.remove(update_callback)
+
+        monkeypatch.setattr(coordinator, "async_add_listener", add_listener)
+        monkeypatch.setattr(coordinator, "async_request_refresh", AsyncMock())
+        monkeypatch.setattr(coordinator, "async_refresh", AsyncMock())
+        return registered
 
     async def test_init(self, coordinator):
         """Test coordinator initialization."""
         assert coordinator._device_id == "34:5f:45:ec:b8:34"
-        assert coordinator._auth_failure_count == 0
+        assert coordinator._auth_history == 0
         assert coordinator._repair_issue_created is False
+        assert coordinator.always_update is False
+        assert coordinator.device_info["identifiers"] == {(DOMAIN, "34:5f:45:ec:b8:34")}
 
     async def test_update_data_success(self, coordinator, mock_duux_api, mock_api_responses):
         """Test successful data update."""
@@ -53,21 +64,50 @@ class TestDuuxDataUpdateCoordinator:
         result = await coordinator._async_update_data()
         
         assert result == mock_api_responses["status_success"]["data"]
-        assert coordinator._auth_failure_count == 0
+        assert coordinator._auth_history == 0
 
-    async def test_update_data_success_after_auth_failures(self, coordinator, mock_duux_api, mock_api_responses):
+    async def test_update_data_success_after_auth_failures(self, coordinator, mock_duux_api, mock_api_responses, mock_issue_registry):
         """Test successful data update after previous auth failures."""
-        coordinator._auth_failure_count = 2
+        coordinator._auth_history = 0b11
         coordinator._repair_issue_created = True
         mock_duux_api.get_status.return_value = mock_api_responses["status_success"]
-        
-        with patch("custom_components.duux.coordinator.ir.async_delete_issue") as mock_delete:
-            result = await coordinator._async_update_data()
+
+        result = await coordinator._async_update_data()
         
         assert result == mock_api_responses["status_success"]["data"]
-        assert coordinator._auth_failure_count == 0
+        assert coordinator._auth_history == 0b110
         assert coordinator._repair_issue_created is False
-        mock_delete.assert_called_once_with(coordinator.hass, DOMAIN, REPAIR_ISSUE_AUTH_FAILED)
+        mock_issue_registry.async_delete_issue.assert_called_once_with(coordinator.hass, DOMAIN, REPAIR_ISSUE_AUTH_FAILED)
+
+    async def test_update_data_unchanged_backs_off(self, coordinator, mock_duux_api, mock_api_responses):
+        """Test polling slows down while the device state is unchanged."""
+        coordinator.data = mock_api_responses["status_success"]["data"]
+        mock_duux_api.get_status.return_value = mock_api_responses["status_success"]
+
+        await coordinator._async_update_data()
+        assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL * 1.5)
+
+        for _ in range(20):
+            await coordinator._async_update_data()
+        assert coordinator.update_interval == timedelta(seconds=MAX_SCAN_INTERVAL)
+
+    async def test_update_data_changed_resets_interval(self, coordinator, mock_duux_api, mock_api_responses):
+        """Test polling returns to the default interval when the state changes."""
+        coordinator.data = mock_api_responses["status_off"]["data"]
+        coordinator.update_interval = timedelta(seconds=MAX_SCAN_INTERVAL)
+        mock_duux_api.get_status.return_value = mock_api_responses["status_success"]
+
+        await coordinator._async_update_data()
+
+        assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
+
+    def test_notify_command_sent_resets_interval(self, coordinator):
+        """Test a user command restores the default polling interval."""
+        coordinator.update_interval = timedelta(seconds=MAX_SCAN_INTERVAL)
+
+        coordinator.notify_command_sent()
+
+        assert coordinator.update_interval == timedelta(seconds=DEFAULT_SCAN_INTERVAL)
 
     async def test_update_data_invalid_response(self, coordinator, mock_duux_api):
         """Test data update with invalid response."""
@@ -83,84 +123,123 @@ class TestDuuxDataUpdateCoordinator:
         with pytest.raises(UpdateFailed, match="Error communicating with Duux API"):
             await coordinator._async_update_data()
         
-        assert coordinator._auth_failure_count == 0
+        assert coordinator._auth_history == 0
+
+    @pytest.mark.parametrize(
+        ("history", "created", "message", "expected_history", "expect_issue"),
+        [
+            pytest.param(0, False, "401 Unauthorized", 0b1, False, id="first_failure"),
+            pytest.param(0b11, False, "403 Forbidden", 0b111, True, id="third_failure"),
+            pytest.param(
+                0b101, False, "401 Unauthorized", 0b1011, False, id="not_consecutive"
+            ),
+            pytest.param(
+                0b11111, True, "Token expired", 0b111111, False, id="no_duplicate_repair"
+            ),
+        ],
+    )
+    async def test_update_data_auth_error(
+        self,
+        coordinator,
+        mock_duux_api,
+        mock_issue_registry,
+        history,
+        created,
+        message,
+        expected_history,
+        expect_issue,
+    ):
+        """Test auth failures raise a repair issue only after 3 in a row."""
+        coordinator._auth_history = history
+        coordinator._repair_issue_created = created
+        mock_duux_api.get_status.side_effect = DuuxApiError(message)
 
-    async def test_update_data_auth_error_first_failure(self, coordinator, mock_duux_api):
-        """Test data update with authentication error - first failure."""
-        mock_duux_api.get_status.side_effect = DuuxApiError("401 Unauthorized")
-        
         with pytest.raises(UpdateFailed):
             await coordinator._async_update_data()
-        
-        assert coordinator._auth_failure_count == 1
-        assert coordinator._repair_issue_created is False
 
-    async def test_update_data_auth_error_third_failure(self, coordinator, mock_duux_api):
-        """Test data update with authentication error - third failure creates repair issue."""
-        coordinator._auth_failure_count = 2
-        mock_duux_api.get_status.side_effect = DuuxApiError("403 Forbidden")
-        
-        with patch("custom_components.duux.coordinator.ir.async_create_issue") as mock_create:
-            with pytest.raises(UpdateFailed):
-                await coordinator._async_update_data()
+        assert coordinator._auth_history == expected_history
+        assert coordinator._repair_issue_created is (created or expect_issue)
+        assert mock_issue_registry.async_create_issue.called is expect_issue
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("401 Unauthorized", True),
+            ("403 Forbidden", True),
+            ("Request unauthorized", True),
+            ("Token expired", True),
+            ("Invalid token provided", True),
+            ("UNAUTHORIZED ACCESS", True),
+            ("Network timeout", False),
+            ("500 Internal Server Error", False),
+        ],
+    )
+    def test_is_auth_error(self, coordinator, message, expected):
+        """Test auth error detection."""
+        assert coordinator._is_auth_error(message) is expected
+
+    def test_create_auth_repair_issue(self, coordinator, mock_issue_registry):
+        """Test repair issue creation."""
+        coordinator._create_auth_repair_issue()
         
-        assert coordinator._auth_failure_count == 3
-        assert coordinator._repair_issue_created is True
-        mock_create.assert_called_once()
+        mock_issue_registry.async_create_issue.assert_called_once_with(
+            coordinator.hass,
+            DOMAIN,
+            REPAIR_ISSUE_AUTH_FAILED,
+            is_fixable=False,
+            severity=mock_issue_registry.async_create_issue.call_args[1]["severity"],
+            translation_key="auth_failed",
+            translation_placeholders={"device_id": "34:5f:45:ec:b8:34"},
+        )
 
-    async def test_update_data_auth_error_no_duplicate_repair(self, coordinator, mock_duux_api):
-        """Test that repair issue is not created twice."""
-        coordinator._auth_failure_count = 5
-        coordinator._repair_issue_created = True
-        mock_duux_api.get_status.side_effect = DuuxApiError("Token expired")
-        
-        with patch("custom_components.duux.coordinator.ir.async_create_issue") as mock_create:
-            with pytest.raises(UpdateFailed):
-                await coordinator._async_update_data()
-        
-        assert coordinator._auth_failure_count == 6
-        mock_create.assert_not_called()
+    async def test_confirm_state_already_reported(self, coordinator, listeners):
+        """Test no extra refresh is forced when the first refresh confirms the state."""
+        coordinator.data = {"power": 0}
 
-    def test_is_auth_error_401(self, coordinator):
-        """Test auth error detection for 401."""
-        assert coordinator._is_auth_error("401 Unauthorized") is True
+        await coordinator.async_confirm_state({"power": 0})
 
-    def test_is_auth_error_403(self, coordinator):
-        """Test auth error detection for 403."""
-        assert coordinator._is_auth_error("403 Forbidden") is True
+        coordinator.async_request_refresh.assert_called_once()
+        coordinator.async_refresh.assert_not_called()
+        assert not listeners
 
-    def test_is_auth_error_unauthorized(self, coordinator):
-        """Test auth error detection for unauthorized text."""
-        assert coordinator._is_auth_error("Request unauthorized") is True
+    async def test_confirm_state_reported_later(self, coordinator, listeners):
+        """Test a later coordinator update confirms the state without a forced refresh."""
+        coordinator.data = {"power": 1}
 
-    def test_is_auth_error_token_expired(self, coordinator):
-        """Test auth error detection for token expired."""
-        assert coordinator._is_auth_error("Token expired") is True
+        def report_off():
+            coordinator.data = {"power": 0}
+            for update_callback in list(listeners):
+                update_callback()
 
-    def test_is_auth_error_invalid_token(self, coordinator):
-        """Test auth error detection for invalid token."""
-        assert coordinator._is_auth_error("Invalid token provided") is True
+        coordinator.async_request_refresh.side_effect = (
+            lambda: asyncio.get_running_loop().call_soon(report_off)
+        )
 
-    def test_is_auth_error_case_insensitive(self, coordinator):
-        """Test auth error detection is case insensitive."""
-        assert coordinator._is_auth_error("UNAUTHORIZED ACCESS") is True
+        await coordinator.async_confirm_state({"power": 0})
 
-    def test_is_auth_error_non_auth(self, coordinator):
-        """Test non-auth error is not detected as auth error."""
-        assert coordinator._is_auth_error("Network timeout") is False
-        assert coordinator._is_auth_error("500 Internal Server Error") is False
+        coordinator.async_refresh.assert_not_called()
+        assert not listeners
 
-    def test_create_auth_repair_issue(self, coordinator):
-        """Test repair issue creation."""
-        with patch("custom_components.duux.coordinator.ir.async_create_issue") as mock_create:
-            coordinator._create_auth_repair_issue()
-        
-        mock_create.assert_called_once_with(
-            coordinator.hass,
-            DOMAIN,
-            REPAIR_ISSUE_AUTH_FAILED,
-            is_fixable=False,
-            severity=mock_create.call_args[1]["severity"],
-            translation_key="auth_failed",
-            translation_placeholders={"device_id": "34:5f:45:ec:b8:34"},
-        )
\ No newline at end of file
+    async def test_confirm_state_unconfirmed_fetches_again(
+        self, coordinator, listeners, monkeypatch, mock_http_context, mock_api_responses
+    ):
+        """Test an unconfirmed state forces a refresh that bypasses the status cache."""
+        monkeypatch.setattr("custom_components.duux.coordinator.COMMAND_CONFIRM_TIMEOUT", 0)
+        session = Mock()
+        session.get.return_value = mock_http_context(
+            True, mock_api_responses["status_success"]
+        )
+        coordinator.api = DuuxApiClient(session, "34:5f:45:ec:b8:34", "test_token")
+
+        async def refresh():
+            coordinator.data = await coordinator._async_update_data()
+
+        monkeypatch.setattr(coordinator, "async_request_refresh", AsyncMock(side_effect=refresh))
+        monkeypatch.setattr(coordinator, "async_refresh", AsyncMock(side_effect=refresh))
+
+        await coordinator.async_confirm_state({"power": 0})
+
+        coordinator.async_refresh.assert_called_once()
+        # The forced refresh must reach the device rather than the cached status
+        assert session.get.call_count == 2
+        assert not listeners
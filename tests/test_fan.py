@@ -1,34 +1,63 @@
 """Tests for the Duux fan entity."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, Mock, patch
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, call
 import pytest
-from homeassistant.core import HomeAssistant
 from homeassistant.components.fan import FanEntityFeature
 
-from custom_components.duux.fan import DuuxFan
+from custom_components.duux.fan import DuuxFan, _speed_from_percentage
 from custom_components.duux.api import DuuxApiError
 from custom_components.duux.const import DOMAIN, REPAIR_ISSUE_AUTH_FAILED
 
+_STATUS_ON = {
+    "power": 1, "speed": 15, "mode": 0, "night": 0, "lock": 0, "horosc": 1, "verosc": 0
+}
+_STATUS_OFF = {
+    "power": 0, "speed": 1, "mode": 0, "night": 0, "lock": 0, "horosc": 0, "verosc": 0
+}
+
+
+class _LoopHass:
+    """Just enough of Home Assistant for a real Debouncer to run its timer."""
+
+    @property
+    def loop(self):
+        return asyncio.get_running_loop()
+
+    def async_create_task(self, target, *args, **kwargs):
+        return asyncio.get_running_loop().create_task(target)
+
+    async_create_background_task = async_create_task
+
+    def async_run_hass_job(self, job, *args, **kwargs):
+        return asyncio.get_running_loop().create_task(job.target(*args))
+
 
 @pytest.mark.unit
+@pytest.mark.usefixtures("mock_issue_registry")
 class TestDuuxFan:
     """Test the DuuxFan entity."""
 
     @pytest.fixture
     def mock_hass(self):
         """Mock Home Assistant."""
-        hass = Mock(spec=HomeAssistant)
-        hass.data = {DOMAIN: {}}
-        return hass
+        return SimpleNamespace(data={DOMAIN: {}})
 
     @pytest.fixture
-    def mock_coordinator(self, mock_duux_api, mock_api_responses):
+    def mock_coordinator(self, mock_duux_api, mock_api_responses, mock_config_entry):
         """Mock coordinator."""
         coordinator = Mock()
         coordinator.data = mock_api_responses["status_success"]["data"]
+        coordinator.device_info = {
+            "identifiers": {(DOMAIN, mock_config_entry.data["device_id"])},
+            "name": "Duux Fan",
+            "manufacturer": "Duux",
+            "model": "Smart Fan",
+        }
         coordinator.api = mock_duux_api
-        coordinator.async_request_refresh = AsyncMock()
+        coordinator.async_confirm_state = AsyncMock()
         return coordinator
 
     @pytest.fixture
@@ -36,6 +65,19 @@ class TestDuuxFan:
         """Create a fan entity for testing."""
         return DuuxFan(mock_coordinator, mock_config_entry)
 
+    @pytest.fixture
+    def debounced_fan(self, mock_coordinator, mock_config_entry, monkeypatch):
+        """Create a fan entity whose speed debouncer really runs, without a cooldown."""
+        monkeypatch.setattr("custom_components.duux.fan.SPEED_DEBOUNCE_COOLDOWN", 0)
+        mock_coordinator.hass = _LoopHass()
+        return DuuxFan(mock_coordinator, mock_config_entry)
+
+    @pytest.fixture
+    def fan_entity_quiet(self, fan_entity):
+        """Create a fan entity whose API error handler is a mock."""
+        fan_entity._handle_api_error = Mock()
+        return fan_entity
+
     def test_init(self, fan_entity, mock_config_entry):
         """Test fan entity initialization."""
         assert fan_entity._attr_unique_id == mock_config_entry.data["device_id"]
@@ -57,195 +99,230 @@ class TestDuuxFan:
         assert device_info["manufacturer"] == "Duux"
         assert device_info["model"] == "Smart Fan"
 
-    def test_is_on_true(self, fan_entity, mock_coordinator, mock_api_responses):
-        """Test is_on when fan is on."""
-        mock_coordinator.data = mock_api_responses["status_success"]["data"]
-        assert fan_entity.is_on is True
-
-    def test_is_on_false(self, fan_entity, mock_coordinator, mock_api_responses):
-        """Test is_on when fan is off."""
-        mock_coordinator.data = mock_api_responses["status_off"]["data"]
-        assert fan_entity.is_on is False
-
-    def test_is_on_none(self, fan_entity, mock_coordinator):
-        """Test is_on when no data."""
-        mock_coordinator.data = None
-        assert fan_entity.is_on is None
-
-    def test_percentage(self, fan_entity, mock_coordinator, mock_api_responses):
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            (_STATUS_ON, True),
+            (_STATUS_OFF, False),
+            (None, None),
+        ],
+        ids=["on", "off", "no_data"],
+    )
+    def test_is_on(self, fan_entity, mock_coordinator, data, expected):
+        """Test is_on follows the reported power state."""
+        mock_coordinator.data = data
+        fan_entity._update_attr()
+        assert fan_entity.is_on is expected
+
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            # Speed 15 out of 30 should be 50%
+            (_STATUS_ON, 50),
+            # Speed 1 out of 30 should be approximately 3%
+            ({"speed": 1}, 3),
+            ({"speed": 30}, 100),
+            # Speeds outside the device range are clamped, never wrapped
+            ({"speed": 45}, 100),
+            ({"speed": -1}, 0),
+            (None, None),
+            ({"power": 1}, None),
+        ],
+        ids=["half", "min_speed", "max_speed", "above_max", "negative", "no_data", "no_speed"],
+    )
+    def test_percentage(self, fan_entity, mock_coordinator, data, expected):
         """Test percentage calculation."""
-        # Speed 15 out of 30 should be 50%
-        mock_coordinator.data = mock_api_responses["status_success"]["data"]
-        assert fan_entity.percentage == 50
-
-    def test_percentage_min_speed(self, fan_entity, mock_coordinator):
-        """Test percentage at minimum speed."""
-        mock_coordinator.data = {"speed": 1}
-        # Speed 1 out of 30 should be approximately 3%
-        assert fan_entity.percentage == 3
-
-    def test_percentage_max_speed(self, fan_entity, mock_coordinator):
-        """Test percentage at maximum speed."""
-        mock_coordinator.data = {"speed": 30}
-        assert fan_entity.percentage == 100
-
-    def test_percentage_none(self, fan_entity, mock_coordinator):
-        """Test percentage when no data."""
-        mock_coordinator.data = None
-        assert fan_entity.percentage is None
-
-    def test_percentage_no_speed(self, fan_entity, mock_coordinator):
-        """Test percentage when speed is not in data."""
-        mock_coordinator.data = {"power": 1}
-        assert fan_entity.percentage is None
+        mock_coordinator.data = data
+        fan_entity._update_attr()
+        assert fan_entity.percentage == expected
 
     def test_speed_count(self, fan_entity):
         """Test speed count."""
         assert fan_entity.speed_count == 30
 
-    def test_oscillating_true(self, fan_entity, mock_coordinator, mock_api_responses):
-        """Test oscillating when enabled."""
-        mock_coordinator.data = mock_api_responses["status_success"]["data"]
-        assert fan_entity.oscillating is True
-
-    def test_oscillating_false(self, fan_entity, mock_coordinator, mock_api_responses):
-        """Test oscillating when disabled."""
-        mock_coordinator.data = mock_api_responses["status_off"]["data"]
-        assert fan_entity.oscillating is False
-
-    def test_oscillating_none(self, fan_entity, mock_coordinator):
-        """Test oscillating when no data."""
-        mock_coordinator.data = None
-        assert fan_entity.oscillating is None
+    @pytest.mark.parametrize(
+        ("data", "expected"),
+        [
+            (_STATUS_ON, True),
+            (_STATUS_OFF, False),
+            (None, None),
+        ],
+        ids=["enabled", "disabled", "no_data"],
+    )
+    def test_oscillating(self, fan_entity, mock_coordinator, data, expected):
+        """Test oscillating follows the reported oscillation state."""
+        mock_coordinator.data = data
+        fan_entity._update_attr()
+        assert fan_entity.oscillating is expected
+
+    @pytest.mark.parametrize(
+        ("percentage", "expected"),
+        [(50, 15), (100, 30), (150, 30), (-5, 0)],
+        ids=["half", "max", "above_max", "negative"],
+    )
+    def test_speed_from_percentage(self, percentage, expected):
+        """Test percentages outside 0-100 are clamped, never wrapped."""
+        assert _speed_from_percentage(percentage) == expected
 
     async def test_turn_on_success(self, fan_entity, mock_coordinator, mock_duux_api):
         """Test successful turn on."""
         await fan_entity.async_turn_on()
         
         mock_duux_api.turn_on.assert_called_once()
-        mock_coordinator.async_request_refresh.assert_called_once()
+        mock_coordinator.async_confirm_state.assert_called_once_with({"power": 1})
 
     async def test_turn_on_with_percentage(self, fan_entity, mock_coordinator, mock_duux_api):
         """Test turn on with specific percentage."""
         await fan_entity.async_turn_on(percentage=75)
         
         mock_duux_api.turn_on.assert_called_once()
-        # 75% of 30 speeds = 22.5, rounded to 23
-        mock_duux_api.set_speed.assert_called_once_with(23)
-        mock_coordinator.async_request_refresh.assert_called_once()
+        # 75% of 30 speeds = 22.5, truncated to 22
+        mock_duux_api.set_speed.assert_called_once_with(22)
+        mock_coordinator.async_confirm_state.assert_called_once()
+
+    async def test_turn_on_with_percentage_powers_on_first(self, fan_entity_quiet, mock_duux_api):
+        """Test the speed is only sent once the fan was turned on."""
+        await fan_entity_quiet.async_turn_on(percentage=50)
 
-    async def test_turn_on_api_error(self, fan_entity, mock_coordinator, mock_duux_api):
-        """Test turn on with API error."""
+        assert [name for name, _, _ in mock_duux_api.mock_calls] == ["turn_on", "set_speed"]
+
+        mock_duux_api.reset_mock()
         mock_duux_api.turn_on.side_effect = DuuxApiError("Connection failed")
-        
-        with patch.object(fan_entity, '_handle_api_error') as mock_handle_error:
-            await fan_entity.async_turn_on()
-        
-        mock_handle_error.assert_called_once()
+
+        await fan_entity_quiet.async_turn_on(percentage=50)
+
+        mock_duux_api.set_speed.assert_not_called()
+        fan_entity_quiet._handle_api_error.assert_called_once()
 
     async def test_turn_off_success(self, fan_entity, mock_coordinator, mock_duux_api):
         """Test successful turn off."""
         await fan_entity.async_turn_off()
         
         mock_duux_api.turn_off.assert_called_once()
-        mock_coordinator.async_request_refresh.assert_called_once()
+        mock_coordinator.async_confirm_state.assert_called_once_with({"power": 0})
 
-    async def test_turn_off_api_error(self, fan_entity, mock_coordinator, mock_duux_api):
-        """Test turn off with API error."""
-        mock_duux_api.turn_off.side_effect = DuuxApiError("Connection failed")
-        
-        with patch.object(fan_entity, '_handle_api_error') as mock_handle_error:
-            await fan_entity.async_turn_off()
-        
-        mock_handle_error.assert_called_once()
+    async def test_set_percentage_success(self, debounced_fan, mock_coordinator, mock_duux_api):
+        """Test the debounced speed is sent before the call returns."""
+        await debounced_fan.async_set_percentage(50)
 
-    async def test_set_percentage_success(self, fan_entity, mock_coordinator, mock_duux_api):
-        """Test successful set percentage."""
-        await fan_entity.async_set_percentage(50)
-        
         # 50% of 30 speeds = 15
         mock_duux_api.set_speed.assert_called_once_with(15)
-        mock_coordinator.async_request_refresh.assert_called_once()
+        mock_coordinator.async_confirm_state.assert_called_once_with({"speed": 15})
 
-    async def test_set_percentage_api_error(self, fan_entity, mock_coordinator, mock_duux_api):
-        """Test set percentage with API error."""
-        mock_duux_api.set_speed.side_effect = DuuxApiError("Connection failed")
-        
-        with patch.object(fan_entity, '_handle_api_error') as mock_handle_error:
-            await fan_entity.async_set_percentage(50)
-        
-        mock_handle_error.assert_called_once()
+    async def test_set_percentage_coalesced(self, debounced_fan, mock_duux_api):
+        """Test a burst of speed changes sends only the last one."""
+        await asyncio.gather(
+            debounced_fan.async_set_percentage(10),
+            debounced_fan.async_set_percentage(50),
+        )
+
+        mock_duux_api.set_speed.assert_called_once_with(15)
+
+    async def test_set_percentage_during_send(self, debounced_fan, mock_duux_api):
+        """Test a speed requested while another one is being sent is sent too."""
+        later = []
+
+        async def request_next_speed(speed):
+            if not later:
+                later.append(asyncio.ensure_future(debounced_fan.async_set_percentage(100)))
+                await asyncio.sleep(0)
+
+        mock_duux_api.set_speed.side_effect = request_next_speed
+
+        await debounced_fan.async_set_percentage(50)
+        async with asyncio.timeout(1):
+            await later[0]
+
+        assert mock_duux_api.set_speed.call_args_list == [call(15), call(30)]
+
+    async def test_set_percentage_error_during_send(self, debounced_fan, mock_duux_api):
+        """Test an unexpected error fails its own call without stranding a queued one."""
+        later = []
+
+        async def fail_then_queue(speed):
+            if not later:
+                later.append(asyncio.ensure_future(debounced_fan.async_set_percentage(100)))
+                await asyncio.sleep(0)
+                raise ValueError("Speed must be between 1 and 30")
+
+        mock_duux_api.set_speed.side_effect = fail_then_queue
+
+        async with asyncio.timeout(1):
+            with pytest.raises(ValueError):
+                await debounced_fan.async_set_percentage(50)
+            await later[0]
+
+        assert mock_duux_api.set_speed.call_args_list == [call(15), call(30)]
 
     async def test_oscillate_on_success(self, fan_entity, mock_coordinator, mock_duux_api):
         """Test successful oscillate on."""
         await fan_entity.async_oscillate(True)
         
         mock_duux_api.set_oscillation.assert_called_once_with(True)
-        mock_coordinator.async_request_refresh.assert_called_once()
+        mock_coordinator.async_confirm_state.assert_called_once_with({"horosc": 1})
 
     async def test_oscillate_off_success(self, fan_entity, mock_coordinator, mock_duux_api):
         """Test successful oscillate off."""
         await fan_entity.async_oscillate(False)
         
         mock_duux_api.set_oscillation.assert_called_once_with(False)
-        mock_coordinator.async_request_refresh.assert_called_once()
-
-    async def test_oscillate_api_error(self, fan_entity, mock_coordinator, mock_duux_api):
-        """Test oscillate with API error."""
-        mock_duux_api.set_oscillation.side_effect = DuuxApiError("Connection failed")
-        
-        with patch.object(fan_entity, '_handle_api_error') as mock_handle_error:
-            await fan_entity.async_oscillate(True)
-        
-        mock_handle_error.assert_called_once()
-
-    def test_handle_api_error_auth_error(self, fan_entity, mock_config_entry):
+        mock_coordinator.async_confirm_state.assert_called_once_with({"horosc": 0})
+
+    @pytest.mark.parametrize(
+        ("call", "api_method", "args"),
+        [
+            ("async_turn_on", "turn_on", ()),
+            ("async_turn_off", "turn_off", ()),
+            ("_async_send_pending_percentage", "set_speed", ()),
+            ("async_oscillate", "set_oscillation", (True,)),
+        ],
+    )
+    async def test_api_error(self, fan_entity_quiet, mock_duux_api, call, api_method, args):
+        """Test each command hands API errors to the error handler."""
+        getattr(mock_duux_api, api_method).side_effect = DuuxApiError("Connection failed")
+        # Speed changes are sent by the debouncer callback
+        fan_entity_quiet._pending_percentage = 50
+
+        await getattr(fan_entity_quiet, call)(*args)
+
+        fan_entity_quiet._handle_api_error.assert_called_once()
+
+    def test_handle_api_error_auth_error(self, fan_entity, mock_config_entry, mock_issue_registry):
         """Test handling authentication error."""
         error = DuuxApiError("401 Unauthorized")
+
+        fan_entity._handle_api_error(error, "Test operation")
         
-        with patch("custom_components.duux.fan.ir.async_create_issue") as mock_create:
-            fan_entity._handle_api_error(error, "Test operation")
-        
-        mock_create.assert_called_once_with(
+        mock_issue_registry.async_create_issue.assert_called_once_with(
             fan_entity.hass,
             DOMAIN,
             REPAIR_ISSUE_AUTH_FAILED,
             is_fixable=False,
-            severity=mock_create.call_args[1]["severity"],
+            severity=mock_issue_registry.async_create_issue.call_args[1]["severity"],
             translation_key="auth_failed",
             translation_placeholders={"device_id": mock_config_entry.data["device_id"]},
         )
 
-    def test_handle_api_error_non_auth(self, fan_entity):
+    def test_handle_api_error_non_auth(self, fan_entity, mock_issue_registry):
         """Test handling non-authentication error."""
         error = DuuxApiError("Network timeout")
-        
-        with patch("custom_components.duux.fan.ir.async_create_issue") as mock_create:
-            fan_entity._handle_api_error(error, "Test operation")
-        
-        mock_create.assert_not_called()
 
-    def test_is_auth_error_401(self, fan_entity):
-        """Test auth error detection for 401."""
-        assert fan_entity._is_auth_error("401 Unauthorized") is True
-
-    def test_is_auth_error_403(self, fan_entity):
-        """Test auth error detection for 403."""
-        assert fan_entity._is_auth_error("403 Forbidden") is True
-
-    def test_is_auth_error_unauthorized(self, fan_entity):
-        """Test auth error detection for unauthorized text."""
-        assert fan_entity._is_auth_error("Request unauthorized") is True
-
-    def test_is_auth_error_token_expired(self, fan_entity):
-        """Test auth error detection for token expired."""
-        assert fan_entity._is_auth_error("Token expired") is True
-
-    def test_is_auth_error_case_insensitive(self, fan_entity):
-        """Test auth error detection is case insensitive."""
-        assert fan_entity._is_auth_error("INVALID TOKEN") is True
-
-    def test_is_auth_error_non_auth(self, fan_entity):
-        """Test non-auth error is not detected as auth error."""
-        assert fan_entity._is_auth_error("Network timeout") is False
-        assert fan_entity._is_auth_error("500 Internal Server Error") is False
\ No newline at end of file
+        fan_entity._handle_api_error(error, "Test operation")
+        
+        mock_issue_registry.async_create_issue.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            ("401 Unauthorized", True),
+            ("403 Forbidden", True),
+            ("Request unauthorized", True),
+            ("Token expired", True),
+            ("INVALID TOKEN", True),
+            ("Network timeout", False),
+            ("500 Internal Server Error", False),
+        ],
+    )
+    def test_is_auth_error(self, fan_entity, message, expected):
+        """Test auth error detection."""
+        assert fan_entity._is_auth_error(message) is expected
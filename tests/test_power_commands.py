@@ -1,13 +1,27 @@
 """Test to validate the correct power commands for Duux fan."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, Mock
+import asyncio
+from types import MappingProxyType
+
+import aiohttp
 import pytest
 
-# Import the API client from our main module
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+_API_HOST = "v5.api.cloudgarden.nl"
+_API_BASE_URL = f"https://{_API_HOST}"
+
+# Request bodies for the two power commands, indexed by power state; they
+# are only serialized by the session, so every request can share them
+_POWER_BODIES = (
+    {"command": "tune set power 0"},
+    {"command": "tune set power 1"},
+)
+_EXPECTED_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "Authorization": "Bearer test_token",
+    "Host": _API_HOST,
+})
+
 
 class DuuxApiError(Exception):
     """Exception for Duux API errors."""
@@ -20,136 +34,94 @@ class DuuxApiClient:
         self._session = session
         self._device_id = device_id
         self._jwt_token = jwt_token
+        # The command URL and headers never change for a client, so build them once
+        self._command_url = f"{_API_BASE_URL}/sensor/{device_id}/commands"
+        self._post_headers = MappingProxyType({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {jwt_token}",
+            "Host": _API_HOST,
+        })
 
     async def send_command(self, command_text: str) -> dict:
         """Send a text command to the Duux fan."""
-        api_base_url = "https://v5.api.cloudgarden.nl"
-        url = f"{api_base_url}/sensor/{self._device_id}/commands"
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self._jwt_token}",
-            "Host": "v5.api.cloudgarden.nl",
-        }
+        return await self._post_command({"command": command_text})
 
+    async def _post_command(self, command_data: dict) -> dict:
+        """Post a prebuilt command body to the Duux fan."""
         try:
-            command_data = {"command": command_text}
             async with self._session.post(
-                url, json=command_data, headers=headers
+                self._command_url, json=command_data, headers=self._post_headers
             ) as response:
                 if not response.ok:
-                    error_data = await response.json()
-                    raise DuuxApiError(f"Command failed: {error_data}")
+                    body = await response.text()
+                    raise DuuxApiError(f"Command failed: HTTP {response.status}: {body[:200]}")
                 
                 return await response.json()
-        except Exception as err:
+        except asyncio.TimeoutError as err:
+            raise DuuxApiError("Timeout connecting to Duux API") from err
+        except aiohttp.ClientError as err:
             raise DuuxApiError(f"Error connecting to Duux API: {err}") from err
 
     async def turn_on(self) -> None:
         """Turn on the fan."""
-        await self.send_command("tune set power 1")
+        await self._post_command(_POWER_BODIES[1])
 
     async def turn_off(self) -> None:
         """Turn off the fan."""
-        await self.send_command("tune set power 0")
-
-
-@pytest.mark.asyncio
-class TestPowerCommands:
-    """Test the correct power commands implementation."""
-
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.session = Mock()
-        self.api_client = DuuxApiClient(self.session, "34:5f:45:ec:b8:34", "test_token")
-
-    async def test_turn_on_power_command(self):
-        """Test that turn_on sends 'tune set power 1'."""
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value={"success": True})
-        
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-        
-        self.api_client._session.post = Mock(return_value=mock_context_manager)
-        
-        await self.api_client.turn_on()
-        
-        # Verify the exact command sent
-        call_args = self.api_client._session.post.call_args
-        json_data = call_args[1]["json"]
-        assert json_data == {"command": "tune set power 1"}
-
-    async def test_turn_off_power_command(self):
-        """Test that turn_off sends 'tune set power 0'."""
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value={"success": True})
-        
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-        
-        self.api_client._session.post = Mock(return_value=mock_context_manager)
-        
-        await self.api_client.turn_off()
-        
-        # Verify the exact command sent
-        call_args = self.api_client._session.post.call_args
-        json_data = call_args[1]["json"]
-        assert json_data == {"command": "tune set power 0"}
-
-    async def test_power_commands_consistency(self):
-        """Test that power commands are consistent and correct."""
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value={"success": True})
-        
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-        
-        self.api_client._session.post = Mock(return_value=mock_context_manager)
-        
-        # Test turn on
-        await self.api_client.turn_on()
-        call_args = self.api_client._session.post.call_args
-        json_data = call_args[1]["json"]
-        assert json_data["command"] == "tune set power 1"
-        
-        # Test turn off  
-        await self.api_client.turn_off()
-        call_args = self.api_client._session.post.call_args
-        json_data = call_args[1]["json"]
-        assert json_data["command"] == "tune set power 0"
-
-    async def test_api_call_structure(self):
-        """Test that the API call structure is correct."""
-        mock_response = Mock()
-        mock_response.ok = True
-        mock_response.json = AsyncMock(return_value={"success": True})
-        
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_context_manager.__aexit__ = AsyncMock(return_value=None)
-        
-        self.api_client._session.post = Mock(return_value=mock_context_manager)
-        
-        await self.api_client.turn_on()
-        
-        # Verify the URL and headers
-        call_args = self.api_client._session.post.call_args
-        url = call_args[0][0]
-        headers = call_args[1]["headers"]
-        json_data = call_args[1]["json"]
-        
-        assert "34:5f:45:ec:b8:34" in url
-        assert "/commands" in url
-        assert headers["Authorization"] == "Bearer test_token"
-        assert headers["Host"] == "v5.api.cloudgarden.nl"
-        assert headers["Content-Type"] == "application/json"
-        assert json_data == {"command": "tune set power 1"}
+        await self._post_command(_POWER_BODIES[0])
+
+
+class _RecordingSession:
+    """Session stand-in that records each POST and answers with one context.
+
+    Plain methods avoid the Mock call machinery on every request.
+    """
+
+    def __init__(self, context):
+        self._context = context
+        self.calls = []
+
+    def post(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self._context
+
+
+@pytest.fixture
+def fast_session(mock_command_context):
+    """Build a recording session that always answers with a successful command."""
+    return _RecordingSession(mock_command_context)
+
+
+@pytest.fixture
+def api_client(fast_session):
+    """Create a client on the recording session."""
+    return DuuxApiClient(fast_session, "34:5f:45:ec:b8:34", "test_token")
+
+
+@pytest.mark.parametrize(
+    ("action", "expected"),
+    [("turn_on", "tune set power 1"), ("turn_off", "tune set power 0")],
+)
+async def test_power_command(api_client, action, expected):
+    """Test that each power action sends its exact command."""
+    await getattr(api_client, action)()
+
+    _, kwargs = api_client._session.calls[-1]
+    assert kwargs["json"] == {"command": expected}
+
+
+async def test_api_call_structure(api_client):
+    """Test that the API call structure is correct."""
+    await api_client.turn_on()
+    
+    # Verify the URL and headers
+    (url,), kwargs = api_client._session.calls[-1]
+    json_data = kwargs["json"]
+    
+    assert "34:5f:45:ec:b8:34" in url
+    assert "/commands" in url
+    assert kwargs["headers"] == _EXPECTED_HEADERS
+    assert json_data == {"command": "tune set power 1"}
 
 
 if __name__ == "__main__":
@@ -1,180 +1,113 @@
 """Tests for the Duux Natural Wind switch."""
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock
 import pytest
 
-# Mock the necessary Home Assistant components
-class MockSwitchEntity:
-    _attr_has_entity_name = True
-    _attr_name = None
-    _attr_icon = None
-
-class MockCoordinatorEntity:
-    def __init__(self, coordinator):
-        self.coordinator = coordinator
-
-class MockConfigEntry:
-    def __init__(self, **kwargs):
-        self.data = kwargs.get('data', {})
-
-class MockHomeAssistant:
-    def __init__(self):
-        self.data = {}
-
-DOMAIN = "duux"
-REPAIR_ISSUE_AUTH_FAILED = "auth_failed"
-
-class DuuxApiError(Exception):
-    """Exception for Duux API errors."""
-
-# Inline the switch implementation for testing
-class DuuxNaturalWindSwitch(MockCoordinatorEntity, MockSwitchEntity):
-    """Test version of Duux Natural Wind switch."""
-
-    _attr_has_entity_name = True
-    _attr_name = "Natural Wind"
-    _attr_icon = "mdi:weather-windy"
-
-    def __init__(self, coordinator, config_entry) -> None:
-        """Initialize the switch."""
-        super().__init__(coordinator)
-        self._attr_unique_id = f"{config_entry.data['device_id']}_natural_wind"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, config_entry.data["device_id"])},
-            "name": "Duux Fan",
-            "manufacturer": "Duux",
-            "model": "Smart Fan",
-        }
-        self.hass = MockHomeAssistant()
-
-    @property
-    def is_on(self) -> bool | None:
-        """Return true if Natural Wind mode is on."""
-        if self.coordinator.data is None:
-            return None
-        return bool(self.coordinator.data.get("mode", 0) == 1)
-
-    async def async_turn_on(self, **kwargs) -> None:
-        """Turn on Natural Wind mode."""
-        await self.coordinator.api.send_command("tune set mode 1")
-        await self.coordinator.async_request_refresh()
-
-    async def async_turn_off(self, **kwargs) -> None:
-        """Turn off Natural Wind mode."""
-        await self.coordinator.api.send_command("tune set mode 0")
-        await self.coordinator.async_request_refresh()
-
-
-@pytest.mark.asyncio
-class TestDuuxNaturalWindSwitch:
-    """Test the Duux Natural Wind switch."""
-
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.mock_coordinator = Mock()
-        self.mock_coordinator.data = {"mode": 0, "power": 1, "speed": 15}
-        self.mock_coordinator.api = Mock()
-        self.mock_coordinator.api.send_command = AsyncMock()
-        self.mock_coordinator.async_request_refresh = AsyncMock()
-        
-        self.mock_config_entry = MockConfigEntry(
-            data={"device_id": "34:5f:45:ec:b8:34", "jwt_token": "test_token"}
-        )
-        
-        self.switch = DuuxNaturalWindSwitch(self.mock_coordinator, self.mock_config_entry)
-
-    def test_init(self):
-        """Test switch initialization."""
-        assert self.switch._attr_name == "Natural Wind"
-        assert self.switch._attr_icon == "mdi:weather-windy"
-        assert self.switch._attr_unique_id == "34:5f:45:ec:b8:34_natural_wind"
-        assert self.switch._attr_device_info["name"] == "Duux Fan"
-
-    def test_is_on_false(self):
-        """Test is_on when Natural Wind is off."""
-        self.mock_coordinator.data = {"mode": 0}
-        assert self.switch.is_on is False
-
-    def test_is_on_true(self):
-        """Test is_on when Natural Wind is on."""
-        self.mock_coordinator.data = {"mode": 1}
-        assert self.switch.is_on is True
-
-    def test_is_on_none(self):
-        """Test is_on when no data is available."""
-        self.mock_coordinator.data = None
-        assert self.switch.is_on is None
-
-    def test_is_on_missing_mode(self):
-        """Test is_on when mode is missing from data."""
-        self.mock_coordinator.data = {"power": 1, "speed": 15}
-        assert self.switch.is_on is False  # Default to 0 when missing
-
-    async def test_turn_on_success(self):
-        """Test successful turn on."""
-        await self.switch.async_turn_on()
-        
-        self.mock_coordinator.api.send_command.assert_called_once_with("tune set mode 1")
-        self.mock_coordinator.async_request_refresh.assert_called_once()
-
-    async def test_turn_off_success(self):
-        """Test successful turn off."""
-        await self.switch.async_turn_off()
-        
-        self.mock_coordinator.api.send_command.assert_called_once_with("tune set mode 0")
-        self.mock_coordinator.async_request_refresh.assert_called_once()
-
-    async def test_turn_on_api_error(self):
-        """Test turn on with API error."""
-        self.mock_coordinator.api.send_command.side_effect = DuuxApiError("Connection failed")
-        
-        with pytest.raises(DuuxApiError):
-            await self.switch.async_turn_on()
-
-    async def test_turn_off_api_error(self):
-        """Test turn off with API error."""
-        self.mock_coordinator.api.send_command.side_effect = DuuxApiError("Connection failed")
-        
-        with pytest.raises(DuuxApiError):
-            await self.switch.async_turn_off()
-
-    def test_natural_wind_state_changes(self):
-        """Test that switch state reflects mode changes correctly."""
-        # Initially off
-        self.mock_coordinator.data = {"mode": 0}
-        assert self.switch.is_on is False
-        
-        # Turn on
-        self.mock_coordinator.data = {"mode": 1}
-        assert self.switch.is_on is True
-        
-        # Turn off again
-        self.mock_coordinator.data = {"mode": 0}
-        assert self.switch.is_on is False
-
-    def test_device_info_structure(self):
-        """Test device info structure is correct."""
-        device_info = self.switch._attr_device_info
-        assert device_info["identifiers"] == {(DOMAIN, "34:5f:45:ec:b8:34")}
-        assert device_info["name"] == "Duux Fan"
-        assert device_info["manufacturer"] == "Duux"
-        assert device_info["model"] == "Smart Fan"
-
-    async def test_command_format_turn_on(self):
-        """Test that turn on sends correct command format."""
-        await self.switch.async_turn_on()
-        
-        # Verify exact command format
-        self.mock_coordinator.api.send_command.assert_called_once_with("tune set mode 1")
-
-    async def test_command_format_turn_off(self):
-        """Test that turn off sends correct command format."""
-        await self.switch.async_turn_off()
-        
-        # Verify exact command format
-        self.mock_coordinator.api.send_command.assert_called_once_with("tune set mode 0")
+from custom_components.duux.api import DuuxApiError
+from custom_components.duux.const import DOMAIN, REPAIR_ISSUE_AUTH_FAILED
+from custom_components.duux.switch import DuuxNaturalWindSwitch
+
+pytestmark = [pytest.mark.unit, pytest.mark.usefixtures("mock_issue_registry")]
+
+
+@pytest.fixture
+def mock_coordinator(mock_config_entry):
+    """Mock the coordinator behind the switch."""
+    coordinator = Mock()
+    coordinator.data = {"mode": 0, "power": 1, "speed": 15}
+    coordinator.device_info = {
+        "identifiers": {(DOMAIN, mock_config_entry.data["device_id"])},
+        "name": "Duux Fan",
+        "manufacturer": "Duux",
+        "model": "Smart Fan",
+    }
+    coordinator.api.send_command = AsyncMock()
+    coordinator.async_confirm_state = AsyncMock()
+    return coordinator
+
+
+@pytest.fixture
+def switch(mock_coordinator, mock_config_entry):
+    """Create a switch for testing."""
+    return DuuxNaturalWindSwitch(mock_coordinator, mock_config_entry)
+
+
+def test_init(switch):
+    """Test switch initialization."""
+    assert switch._attr_name == "Natural Wind"
+    assert switch._attr_icon == "mdi:weather-windy"
+    assert switch._attr_unique_id == "34:5f:45:ec:b8:34_natural_wind"
+    assert switch._attr_device_info["name"] == "Duux Fan"
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ({"mode": 0}, False),
+        ({"mode": 1}, True),
+        ({"mode": 2}, False),
+        (None, None),
+        ({"power": 1, "speed": 15}, False),  # Default to 0 when missing
+    ],
+    ids=["off", "on", "other_mode", "no_data", "missing_mode"],
+)
+def test_is_on(switch, mock_coordinator, data, expected):
+    """Test is_on reflects the mode reported by the coordinator."""
+    mock_coordinator.data = data
+    assert switch.is_on is expected
+
+
+@pytest.mark.parametrize(
+    ("action", "mode"),
+    [("async_turn_on", 1), ("async_turn_off", 0)],
+)
+async def test_turn_on_off(switch, mock_coordinator, action, mode):
+    """Test each action sends its mode command and waits for the device to confirm it."""
+    await getattr(switch, action)()
+
+    mock_coordinator.api.send_command.assert_called_once_with(f"tune set mode {mode}")
+    mock_coordinator.notify_command_sent.assert_called_once()
+    mock_coordinator.async_confirm_state.assert_called_once_with({"mode": mode})
+
+
+@pytest.mark.parametrize("action", ["async_turn_on", "async_turn_off"])
+async def test_turn_on_off_auth_error(switch, mock_coordinator, mock_issue_registry, action):
+    """Test an auth failure raises a repair issue instead of propagating."""
+    mock_coordinator.api.send_command.side_effect = DuuxApiError("401 Unauthorized")
+
+    await getattr(switch, action)()
+
+    mock_coordinator.async_confirm_state.assert_not_called()
+    mock_issue_registry.async_create_issue.assert_called_once_with(
+        switch.hass,
+        DOMAIN,
+        REPAIR_ISSUE_AUTH_FAILED,
+        is_fixable=False,
+        severity=mock_issue_registry.async_create_issue.call_args[1]["severity"],
+        translation_key="auth_failed",
+        translation_placeholders={"device_id": "34:5f:45:ec:b8:34"},
+    )
+
+
+async def test_turn_on_api_error(switch, mock_coordinator, mock_issue_registry):
+    """Test a non-auth failure is logged without a repair issue."""
+    mock_coordinator.api.send_command.side_effect = DuuxApiError("Connection failed")
+
+    await switch.async_turn_on()
+
+    mock_coordinator.async_confirm_state.assert_not_called()
+    mock_issue_registry.async_create_issue.assert_not_called()
+
+
+def test_device_info_structure(switch):
+    """Test device info structure is correct."""
+    device_info = switch._attr_device_info
+    assert device_info["identifiers"] == {(DOMAIN, "34:5f:45:ec:b8:34")}
+    assert device_info["name"] == "Duux Fan"
+    assert device_info["manufacturer"] == "Duux"
+    assert device_info["model"] == "Smart Fan"
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])